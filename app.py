@@ -5,14 +5,30 @@ from dotenv import load_dotenv
 import os
 import PyPDF2
 import re
-from extract_content import extract_main_content
 from llm_interface import LLMFactory
-import urllib.parse
-from extract_links import extract_links_from_pdf, filter_article_links
+from newsletter_pipeline import synthesize_newsletter
+from renderers import render_markdown
+from newsletter_output import render_all
+from summary_store import SummaryStore
+from shared_service import PipelineService
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import uuid
+from extract_links import extract_link_entries_from_pdf, filter_article_entries
+from link_triage import DEFAULT_TRIAGE_THRESHOLD, format_triage_report, triage_links
 import tempfile
 
 load_dotenv()  # take environment variables from .env.
 
+# Digests with more summaries than this are synthesized per category
+HIERARCHICAL_SYNTHESIS_THRESHOLD = 20
+
+DOWNLOAD_FORMATS = ('docx', 'pdf', 'html', 'txt')
+DOWNLOAD_LABELS = {
+    'pdf': "Download PDF",
+    'html': "Download HTML Email",
+    'txt': "Download Plain Text",
+}
+
 # Initialize LLM
 @st.cache_resource
 def get_llm(use_mock=True, model="gpt-3.5-turbo"):
@@ -31,45 +47,22 @@ def get_llm(use_mock=True, model="gpt-3.5-turbo"):
             raise ValueError("OpenAI API key not found in environment variables")
         return LLMFactory.create_llm("chatgpt", api_key=api_key, model=model)
 
-# Function to process content through LLM
-def summarize_content(llm, content, user_profile):
-    # prompt = f"""
-    # Given the following user profile:
-    # {user_profile}
-    
-    # Please provide a concise summary of the following content, focusing on aspects that would be most relevant to the user profile:
-    
-    # {content}
-    
-    # Please strictly limit the summary to 2-3 paragraphs. If there is no content that is directly relevant to the user profile and their business strategy, please indicate this in your response and do not provide a summary.
-    # """
-
-    prompt = f"""
-    Please provide a concise summary of the following content, focusing on aspects that would be most relevant to the user profile:
-    
-    {content}
-    
-    Please strictly limit the summary to 2-3 paragraphs.
-    """
-    
-    response = llm.generate_response(prompt, max_tokens=300, temperature=0.7)
-    return response.text
-
-
-def synthesize_summaries(llm, user_profile, summaries):
-    with open('prompt.txt', 'r') as f:
-        prompt = f.read()
-
-    prompt = prompt.replace('{profile}', user_profile)
+# Shared across all sessions so that fetches and LLM calls are scheduled and deduplicated together
+@st.cache_resource
+def get_pipeline_service():
+    return PipelineService()
 
-    summaries = [f"## Article {idx+1}\nURL: {url}\n{summary}" for idx, (url, summary) in enumerate(summaries)]
-    prompt = prompt.replace('{articles}', '\n'.join(summaries))
 
-    response = llm.generate_response(prompt, max_tokens=5000, temperature=0.4)
-    return response.text
+def get_session_id():
+    """Stable identifier of the current browser session, used for fair scheduling."""
+    if 'session_id' not in st.session_state:
+        st.session_state['session_id'] = uuid.uuid4().hex
+    return st.session_state['session_id']
 
 
-from GenerateWordDocument import generate_word_doc_from_markdown
+def queue_status(service, session_id):
+    position = service.queue_position(session_id)
+    return f" (queue position {position})" if position else ""
 
 # --- Custom CSS for a cool, neat design ---
 st.markdown(
@@ -126,6 +119,14 @@ user_profile = st.text_area("Enter your user profile text", height=200)
 # use_real_llm = st.checkbox("Use real ChatGPT (requires API key)", value=False)
 use_real_llm = True
 
+# Links whose PDF title and snippet score below this against the profile are skipped
+triage_threshold = st.slider(
+    "Link relevance threshold (0 processes every link)",
+    min_value=0, max_value=10, value=DEFAULT_TRIAGE_THRESHOLD,
+    help="Skips links whose title and snippet share few words with your profile before fetching them. "
+         "Faster and cheaper for large digests, but relevant articles with unrelated-sounding titles may be missed.",
+)
+
 # --- Processing Section ---
 st.header("Step 2: Generate Your Document")
 
@@ -146,6 +147,10 @@ if st.button("Generate Document"):
             # Initialize LLM
             status_text.text("Initializing LLM...")
             llm = get_llm(use_mock=not use_real_llm)  # Use mock by default
+            service = get_pipeline_service()
+            session_id = get_session_id()
+            # Jobs still queued from an earlier run of this session would only hold up everyone else
+            service.cancel_session(session_id)
             progress_bar.progress(10)
             
             # Save uploaded file temporarily
@@ -155,8 +160,15 @@ if st.button("Generate Document"):
             
             # Extract links from PDF using the improved extractor
             status_text.text("Extracting links from PDF...")
-            raw_links = extract_links_from_pdf(tmp_path)
-            links = filter_article_links(raw_links)
+            link_entries = filter_article_entries(extract_link_entries_from_pdf(tmp_path))
+
+            # Skip low-relevance links before paying for any fetch or LLM call
+            kept, skipped = triage_links(link_entries, user_profile, threshold=triage_threshold)
+            links = [result.link.url for result in kept]
+            if skipped:
+                print(f'SKIPPED {len(skipped)} LOW-RELEVANCE LINKS:\n{format_triage_report(skipped)}')
+                with st.expander(f"Skipped {len(skipped)} of {len(link_entries)} links as low relevance"):
+                    st.markdown(format_triage_report(skipped))
             
             # Clean up temporary file
             os.unlink(tmp_path)
@@ -166,37 +178,31 @@ if st.button("Generate Document"):
             # Process each link
             total_links = len(links)
 
-            summaries = []
+            # Spill summaries to disk so they don't accumulate in memory on large digests
+            summaries = SummaryStore()
 
             if total_links == 0:
                 status_text.text("No valid links found in the PDF...")
             else:
-
-                for idx, link in enumerate(links, 1):
-                    print(link)
-                    status_text.text(f"Processing link {idx} of {total_links}...")
-                    progress = 20 + (60 * idx // total_links)  # Progress from 20% to 80%
-                    progress_bar.progress(progress)
-                    
-                    try:
-                        # Clean and validate the URL
-                        clean_url = urllib.parse.unquote(link).strip()
-                        
-                        # Extract content from the link
-                        title, content = extract_main_content(clean_url)
-                        
-                        if content:  # TODO: report on links for which we did not extract the content
-                            # Summarize content using LLM
-
-                            print(len(content))
-                            summary = summarize_content(llm, content, user_profile)
-
-                            print('SUMMARY: ', summary)
-
-                            summaries.append((clean_url,summary))
-                        
-                    except Exception as e:
-                        continue
+                # Links are fetched and summarized by the shared service, interleaved with other sessions
+                pending = {service.summarize_link(session_id, llm, link, user_profile) for link in links}
+                while pending:
+                    done, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            print(f"Error processing link: {str(e)}")
+                            continue
+
+                        if result:  # TODO: report on links for which we did not extract the content
+                            print('SUMMARY: ', result[1])
+                            summaries.append(result)
+
+                    processed = total_links - len(pending)
+                    status_text.text(f"Processed {processed} of {total_links} links..."
+                                     f"{queue_status(service, session_id)}")
+                    progress_bar.progress(20 + (60 * processed // total_links))  # Progress from 20% to 80%
 
 
             # Final document preparation
@@ -205,19 +211,30 @@ if st.button("Generate Document"):
 
             synthesis_llm = get_llm(use_mock=not use_real_llm, model="gpt-4o")
 
-            markdown_output = synthesize_summaries(synthesis_llm, user_profile, summaries)
+            # Synthesis is orchestrated off the UI thread, but every LLM call it makes (one per
+            # category batch when hierarchical) goes through the shared scheduler
+            with ThreadPoolExecutor(max_workers=1) as orchestrator:
+                synthesis = orchestrator.submit(
+                    synthesize_newsletter, synthesis_llm, user_profile, summaries,
+                    hierarchical=len(summaries) > HIERARCHICAL_SYNTHESIS_THRESHOLD,
+                    submit=lambda fn: service.run_llm(session_id, fn),
+                )
+                while not wait([synthesis], timeout=0.5).done:
+                    status_text.text(f"Preparing final document...{queue_status(service, session_id)}")
+            newsletter = synthesis.result()
+            markdown_output = render_markdown(newsletter)
+            summaries.close()
 
 
             print('MARKDOWN OUTPUT: ', markdown_output)
+            # The LLM instances are shared, so these totals cover all sessions since startup
+            print('SUMMARY LLM USAGE (PROCESS-WIDE): ', llm.usage.as_dict())
+            print('SYNTHESIS LLM USAGE (PROCESS-WIDE): ', synthesis_llm.usage.as_dict())
 
             
 
-            doc = generate_word_doc_from_markdown(markdown_output)
-
-            # Save the document to a BytesIO stream
-            doc_io = io.BytesIO()
-            doc.save(doc_io)
-            doc_io.seek(0)
+            # Render all output formats concurrently; repeated renders of the same content hit the cache
+            artifacts = render_all(newsletter, formats=DOWNLOAD_FORMATS)
             
             # Complete
             progress_bar.progress(100)
@@ -225,17 +242,28 @@ if st.button("Generate Document"):
             
             # Provide download button
             st.success("Document generated successfully!")
+            docx_artifact = artifacts['docx']
             st.download_button(
                 label="Download Generated Document",
-                data=doc_io,
-                file_name="personalized_summary.docx",
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                data=docx_artifact.data,
+                file_name=docx_artifact.filename,
+                mime=docx_artifact.mime_type,
             )
+            for fmt in ('pdf', 'html', 'txt'):
+                artifact = artifacts[fmt]
+                st.download_button(
+                    label=DOWNLOAD_LABELS[fmt],
+                    data=artifact.data,
+                    file_name=artifact.filename,
+                    mime=artifact.mime_type,
+                )
             
         except Exception as e:
             st.error(f"An error occurred: {str(e)}")
             
         finally:
+            if 'summaries' in locals():
+                summaries.close()
             # Clear progress indicators
             if 'progress_bar' in locals():
                 progress_bar.empty()
@@ -0,0 +1,144 @@
+import argparse
+import json
+import os
+import random
+
+from extraction_metrics import CORPUS_DIR
+
+# Article prose is assembled from these fragments so that the gold text reads like an article
+SUBJECTS = ('Enterprise buyers', 'The vendor', 'Analysts', 'Regulators', 'Early adopters', 'The research team',
+            'Customer service leaders', 'Chief information officers', 'Smaller competitors', 'The open-source community')
+VERBS = ('are deploying', 'have questioned', 'expect to scale', 'are benchmarking', 'plan to retire',
+         'are renegotiating', 'now audit', 'have started to standardize on', 'are cautious about', 'report savings from')
+OBJECTS = ('autonomous agents in the contact center', 'multimodal models for document review',
+           'retrieval pipelines over internal knowledge bases', 'smaller fine-tuned models at the edge',
+           'inference costs across three cloud providers', 'evaluation suites for hallucination rates',
+           'governance boards for model releases', 'agentic workflows in procurement',
+           'synthetic data for regulated industries', 'usage-based pricing for AI assistants')
+CLAUSES = ('according to figures shared with reporters this week', 'after a year of pilots',
+           'despite concerns about explainability', 'as latency budgets tighten',
+           'while budgets for traditional software flatten', 'ahead of new disclosure rules',
+           'in a shift from last quarter', 'with mixed results so far')
+
+BOILERPLATE_LINKS = ('Home', 'World', 'Business', 'Technology', 'Markets', 'Opinion', 'Science', 'Sport',
+                     'Culture', 'Travel', 'Podcasts', 'Video', 'Newsletters', 'Subscribe', 'Sign in')
+
+
+def sentence(rng):
+    return (f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} {rng.choice(OBJECTS)}, "
+            f"{rng.choice(CLAUSES)}.")
+
+
+def paragraphs(rng, count):
+    return [' '.join(sentence(rng) for _ in range(rng.randint(3, 6))) for _ in range(count)]
+
+
+def script_blob(rng, kilobytes):
+    """Minified-looking inline script of roughly the given size."""
+    statements = []
+    size = 0
+    while size < kilobytes * 1024:
+        name = ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(6))
+        statement = f"var {name}=function(e,t){{return e&&t?e[{rng.randint(0, 99)}]+t.{name}:null}};"
+        statements.append(statement)
+        size += len(statement)
+    return f"<script>{''.join(statements)}</script>"
+
+
+def json_state_blob(rng, kilobytes):
+    """Framework hydration state (e.g. __NEXT_DATA__) of roughly the given size."""
+    items = []
+    size = 0
+    while size < kilobytes * 1024:
+        item = {'id': rng.randint(10 ** 6, 10 ** 7), 'headline': sentence(rng), 'url': f"/story/{len(items)}",
+                'tags': rng.sample(BOILERPLATE_LINKS, 3)}
+        items.append(item)
+        size += len(json.dumps(item))
+    return f'<script id="__NEXT_DATA__" type="application/json">{json.dumps({"props": {"feed": items}})}</script>'
+
+
+def style_blob(rng, kilobytes):
+    rules = []
+    size = 0
+    while size < kilobytes * 1024:
+        rule = f".c-{rng.randint(0, 10 ** 6):x}{{margin:{rng.randint(0, 32)}px;color:#{rng.randint(0, 0xffffff):06x}}}"
+        rules.append(rule)
+        size += len(rule)
+    return f"<style>{''.join(rules)}</style>"
+
+
+def mega_nav(link_count):
+    links = ''.join(f'<li><a href="/section/{idx}">{BOILERPLATE_LINKS[idx % len(BOILERPLATE_LINKS)]} {idx}</a></li>'
+                    for idx in range(link_count))
+    return f'<nav class="mega-menu"><ul>{links}</ul></nav>'
+
+
+def news_page(rng):
+    """~300 KB news page: analytics and ad scripts, a mega menu and most-read cards outside <main>."""
+    title = 'Enterprises move AI agents from pilots into the contact center'
+    body = paragraphs(rng, 14)
+    most_read = ''.join(f'<div class="card"><a href="/story/{idx}">{sentence(rng)}</a></div>' for idx in range(40))
+    html = (f"<!DOCTYPE html><html><head><title>{title} | Daily Ledger</title>"
+            f"{style_blob(rng, 60)}{script_blob(rng, 120)}{script_blob(rng, 80)}</head><body>"
+            f"<header><a href=\"/\">Daily Ledger</a>{mega_nav(300)}</header>"
+            f"<main><h1>{title}</h1>"
+            + ''.join(f"<p>{text}</p>" for text in body) +
+            f"</main><aside class=\"most-read\">{most_read}</aside>"
+            f"<footer>{mega_nav(120)}<p>Copyright Daily Ledger</p></footer>{script_blob(rng, 40)}</body></html>")
+    return html, '\n'.join([title] + body)
+
+
+def blog_page(rng):
+    """~700 KB WordPress page: inline SVG sprite, sidebar widgets and a long comment thread outside <article>."""
+    title = 'What we learned running retrieval pipelines over ten years of support tickets'
+    body = paragraphs(rng, 24)
+    svg = '<svg style="display:none">' + ''.join(
+        f'<symbol id="icon-{idx}"><path d="M{rng.randint(0, 99)} {rng.randint(0, 99)}L{rng.randint(0, 99)} '
+        f'{rng.randint(0, 99)}Z"/></symbol>' for idx in range(3000)) + '</svg>'
+    comments = ''.join(f'<div class="comment"><cite>Reader {idx}</cite><p>{sentence(rng)}</p></div>'
+                       for idx in range(600))
+    html = (f"<!DOCTYPE html><html><head><title>{title} - Engineering Notes</title>"
+            f"{style_blob(rng, 120)}{script_blob(rng, 200)}</head><body>{svg}"
+            f"<header>{mega_nav(80)}</header><div class=\"site\">"
+            f"<article class=\"post\"><h1>{title}</h1>"
+            + ''.join(f"<p>{text}</p>" for text in body) +
+            f"</article><aside class=\"sidebar\">{mega_nav(200)}</aside>"
+            f"<section id=\"comments\">{comments}</section></div><footer>Powered by WordPress</footer></body></html>")
+    return html, '\n'.join([title] + body)
+
+
+def spa_page(rng):
+    """~1.5 MB single-page-app render: hydration JSON and bundles dominate, story in div#content."""
+    title = 'Regulators sketch disclosure rules for autonomous AI agents'
+    body = paragraphs(rng, 18)
+    html = (f"<!DOCTYPE html><html><head><title>{title}</title>{style_blob(rng, 150)}"
+            f"{script_blob(rng, 500)}</head><body><div id=\"__next\">{mega_nav(150)}"
+            f"<div id=\"content\"><h1>{title}</h1>"
+            + ''.join(f"<p>{text}</p>" for text in body) +
+            f"</div>{json_state_blob(rng, 800)}</div></body></html>")
+    return html, '\n'.join([title] + body)
+
+
+PAGES = {
+    'news_full_size': news_page,
+    'wordpress_full_size': blog_page,
+    'spa_full_size': spa_page,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='(Re)generate the full-size synthetic pages of the corpus')
+    parser.add_argument('--corpus-dir', default=CORPUS_DIR)
+    args = parser.parse_args()
+
+    for idx, (name, build) in enumerate(PAGES.items()):
+        html, gold = build(random.Random(idx))
+        with open(os.path.join(args.corpus_dir, f"{name}.html"), 'w', encoding='utf-8') as f:
+            f.write(html)
+        with open(os.path.join(args.corpus_dir, f"{name}.gold.txt"), 'w', encoding='utf-8') as f:
+            f.write(gold + '\n')
+        print(f"{name}: {len(html.encode('utf-8')) / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The benchmarks import the application modules from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,71 @@
+import json
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Tuple
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+MANIFEST_PATH = os.path.join(CORPUS_DIR, 'manifest.json')
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+@dataclass
+class CorpusPage:
+    """An HTML snapshot with its gold main-text annotation, the minimum accepted scores and the memory cap."""
+    name: str
+    layout: str
+    html: str
+    gold: str
+    min_precision: float
+    min_recall: float
+    max_peak_memory_multiple: float
+
+
+def load_corpus(manifest_path: str = MANIFEST_PATH) -> Tuple[int, List[CorpusPage]]:
+    """
+    Load the corpus described by the manifest.
+
+    Returns:
+        tuple: (corpus version, list of CorpusPage)
+    """
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    corpus_dir = os.path.dirname(manifest_path)
+    pages = []
+    for entry in manifest['pages']:
+        with open(os.path.join(corpus_dir, entry['html']), 'r', encoding='utf-8') as f:
+            html = f.read()
+        with open(os.path.join(corpus_dir, entry['gold']), 'r', encoding='utf-8') as f:
+            gold = f.read()
+        pages.append(CorpusPage(
+            name=entry['name'],
+            layout=entry.get('layout', ''),
+            html=html,
+            gold=gold,
+            min_precision=entry['min_precision'],
+            min_recall=entry['min_recall'],
+            max_peak_memory_multiple=entry['max_peak_memory_multiple'],
+        ))
+    return manifest['version'], pages
+
+
+def tokenize(text: str) -> Counter:
+    return Counter(TOKEN_PATTERN.findall(text.lower()))
+
+
+def precision_recall(extracted: str, gold: str) -> Tuple[float, float]:
+    """
+    Bag-of-words precision and recall of extracted text against the gold text.
+
+    Precision is the share of extracted tokens that belong to the main text;
+    recall is the share of main-text tokens that were extracted.
+    """
+    extracted_tokens = tokenize(extracted or '')
+    gold_tokens = tokenize(gold)
+    overlap = sum((extracted_tokens & gold_tokens).values())
+    precision = overlap / sum(extracted_tokens.values()) if extracted_tokens else 0.0
+    recall = overlap / sum(gold_tokens.values()) if gold_tokens else 0.0
+    return precision, recall
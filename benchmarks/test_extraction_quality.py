@@ -0,0 +1,36 @@
+import tracemalloc
+
+import pytest
+
+from extract_content import extract_main_content_from_html
+from extraction_metrics import load_corpus, precision_recall
+
+CORPUS_VERSION, PAGES = load_corpus()
+
+
+@pytest.mark.parametrize('page', PAGES, ids=lambda page: page.name)
+def test_extraction_quality(page):
+    title, content = extract_main_content_from_html(page.html)
+    precision, recall = precision_recall(content, page.gold)
+
+    assert title
+    assert precision >= page.min_precision, f"precision {precision:.3f} < {page.min_precision} ({page.layout})"
+    assert recall >= page.min_recall, f"recall {recall:.3f} < {page.min_recall} ({page.layout})"
+
+
+@pytest.mark.parametrize('page', PAGES, ids=lambda page: page.name)
+def test_extraction_memory(page):
+    # Warm up so that one-off parser imports and caches are not attributed to the page
+    extract_main_content_from_html(page.html)
+
+    tracemalloc.start()
+    try:
+        extract_main_content_from_html(page.html)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    html_size = len(page.html.encode('utf-8'))
+    # Peak traced memory as a multiple of the page's HTML size; the cap is set per page in the manifest
+    assert peak <= page.max_peak_memory_multiple * html_size, \
+        f"peak {peak} bytes is {peak / html_size:.1f}x the {html_size} bytes of HTML ({page.layout})"
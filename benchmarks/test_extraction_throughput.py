@@ -0,0 +1,24 @@
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from extract_content import extract_main_content_from_html
+from extraction_metrics import load_corpus
+
+CORPUS_VERSION, PAGES = load_corpus()
+
+
+@pytest.mark.parametrize('page', PAGES, ids=lambda page: page.name)
+def test_page_parse_throughput(benchmark, page):
+    benchmark.extra_info['corpus_version'] = CORPUS_VERSION
+    benchmark.extra_info['html_bytes'] = len(page.html.encode('utf-8'))
+    title, content = benchmark(extract_main_content_from_html, page.html)
+    assert content
+
+
+def test_corpus_parse_throughput(benchmark):
+    benchmark.extra_info['corpus_version'] = CORPUS_VERSION
+    benchmark.extra_info['pages'] = len(PAGES)
+    benchmark.extra_info['html_bytes'] = sum(len(page.html.encode('utf-8')) for page in PAGES)
+    results = benchmark(lambda: [extract_main_content_from_html(page.html) for page in PAGES])
+    assert all(content for _, content in results)
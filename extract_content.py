@@ -3,6 +3,11 @@ from bs4 import BeautifulSoup
 import argparse
 import sys
 
+# Pages larger than this are truncated; article text is almost always well within the first 2 MB
+MAX_CONTENT_BYTES = 2 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
 def clean_text(text):
     """
     Clean extracted text by removing extra whitespace and empty lines.
@@ -12,29 +17,60 @@ def clean_text(text):
     lines = [line for line in lines if line]
     return '\n'.join(lines)
 
-# TODO: this doesn't work for all websites, need to find a better way to extract the main content for dynamically loaded content
-def extract_main_content(url):
+def fetch_html(url, max_bytes=MAX_CONTENT_BYTES, timeout=5):
     """
-    Extract the main content from a given URL while filtering out advertisements
-    and irrelevant content.
-    
+    Download the HTML of a webpage, streaming at most max_bytes of the body.
+
+    The response headers are checked before the body is read, so non-HTML
+    resources (PDFs, images, videos) are rejected without downloading them.
+
     Args:
-        url (str): The URL of the webpage to extract content from
-        
+        url (str): The URL of the webpage
+        max_bytes (int): Maximum number of body bytes to read; longer pages are truncated
+        timeout (int): Connection and read timeout in seconds
+
+    Returns:
+        str: The (possibly truncated) HTML, or None if the resource is not HTML
+    """
+    with requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+
+        content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type and content_type not in HTML_CONTENT_TYPES:
+            print(f"Skipping non-HTML content ({content_type}): {url}", file=sys.stderr)
+            return None
+
+        # Chunks are appended to one buffer, trimmed to the cap, so the body is held once before decoding
+        body = bytearray()
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            body += chunk[:max_bytes - len(body)]
+            if len(body) >= max_bytes:
+                print(f"Truncating response at {max_bytes} bytes: {url}", file=sys.stderr)
+                break
+
+        return body.decode(response.encoding or 'utf-8', errors='replace')
+
+
+def extract_main_content_from_html(html):
+    """
+    Extract the title and main content from an HTML document.
+
+    The parsed tree is decomposed as soon as the text has been produced, and
+    only plain strings are returned, so no reference to the DOM outlives the call.
+
+    Args:
+        html (str): The HTML document
+
     Returns:
         tuple: (title, text) containing the article title and main content
     """
+    # Parse the HTML
+    soup = BeautifulSoup(html, 'html.parser')
+
     try:
-        # Fetch the webpage
-        response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=5)
-        response.raise_for_status()
-        
-        # Parse the HTML
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Get the title
-        title = soup.title.string if soup.title else ''
-        
+        # Get the title; str() detaches it from the tree
+        title = str(soup.title.string) if soup.title and soup.title.string else ''
+
         # Remove unwanted elements
         for element in soup.find_all(['script', 'style', 'nav', 'header', 'footer', 
                                     'iframe', 'aside', 'form', 'button']):
@@ -68,6 +104,30 @@ def extract_main_content(url):
             content = clean_text(soup.get_text())
         
         return title, content
+    finally:
+        soup.decompose()
+
+
+# TODO: this doesn't work for all websites, need to find a better way to extract the main content for dynamically loaded content
+def extract_main_content(url, max_bytes=MAX_CONTENT_BYTES):
+    """
+    Extract the main content from a given URL while filtering out advertisements
+    and irrelevant content.
+    
+    Args:
+        url (str): The URL of the webpage to extract content from
+        max_bytes (int): Maximum number of bytes of the page to download
+        
+    Returns:
+        tuple: (title, text) containing the article title and main content
+    """
+    try:
+        # Fetch the webpage
+        html = fetch_html(url, max_bytes=max_bytes)
+        if html is None:
+            return None, None
+
+        return extract_main_content_from_html(html)
     
     except Exception as e:
         print(f"Error processing URL: {str(e)}", file=sys.stderr)
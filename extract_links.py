@@ -1,6 +1,25 @@
 
 import PyPDF2
 import urllib.parse as urlparse
+from dataclasses import dataclass
+from typing import List
+
+# Tolerance in points when matching text to a link rectangle
+RECT_TOLERANCE = 3
+# How far below a link (in points) to look for its snippet text
+SNIPPET_DEPTH = 90
+
+
+@dataclass
+class PdfLink:
+    """A link annotation from a PDF together with its anchor text and the snippet printed below it."""
+    url: str
+    title: str = ''
+    snippet: str = ''
+
+    @property
+    def text(self):
+        return f"{self.title} {self.snippet}".strip()
 
 
 def extract_article_url(url):    
@@ -33,6 +52,124 @@ def extract_article_url(url):
     return None
 
 
+def get_annotations(page):
+    annotations = page['/Annots'] if '/Annots' in page else []
+    if hasattr(annotations, "get_object"):
+        annotations = annotations.get_object()
+    for annotation in annotations:
+        if hasattr(annotation, "get_object"):
+            annotation = annotation.get_object()
+        yield annotation
+
+
+def get_text_fragments(page):
+    """
+    Return the text fragments of a page with their position in page (user space) coordinates.
+    """
+    fragments = []
+
+    def visitor(text, cm, tm, font_dict, font_size):
+        if not text.strip():
+            return
+        # Text position is the text matrix origin mapped through the current transformation matrix
+        x = cm[0] * tm[4] + cm[2] * tm[5] + cm[4]
+        y = cm[1] * tm[4] + cm[3] * tm[5] + cm[5]
+        fragments.append((x, y, text))
+
+    page.extract_text(visitor_text=visitor)
+    return fragments
+
+
+def join_fragments(fragments):
+    """Join fragments top-to-bottom, left-to-right: fragments on one line are concatenated, lines joined by spaces."""
+    lines = {}
+    for x, y, text in fragments:
+        lines.setdefault(round(y), []).append((x, text))
+    joined = [''.join(text for _, text in sorted(parts)) for _, parts in sorted(lines.items(), reverse=True)]
+    return ' '.join(' '.join(line.split()) for line in joined).strip()
+
+
+def get_link_annotations(page):
+    """
+    Return (url, rect) for each URI link annotation of a page. rect is None if the
+    annotation has no usable /Rect; malformed annotations are skipped.
+    """
+    links = []
+    try:
+        for annotation in get_annotations(page):
+            try:
+                if annotation.get('/Subtype', '') != '/Link' or '/A' not in annotation or '/URI' not in annotation['/A']:
+                    continue
+                url = annotation['/A']['/URI']
+            except Exception as e:
+                print(f"Skipping malformed link annotation: {str(e)}")
+                continue
+            try:
+                rect = sorted_rect(annotation['/Rect'])
+            except Exception:
+                rect = None
+            links.append((url, rect))
+    except Exception as e:
+        print(f"Error reading annotations: {str(e)}")
+    return links
+
+
+def extract_link_entries_from_pdf(file_path) -> List[PdfLink]:
+    """
+    Extract link annotations from a PDF with the anchor text inside each link's
+    rectangle as its title and the text printed just below it as its snippet.
+
+    In a Google Alert digest the title is the article headline and source, and
+    the snippet is the excerpt Google shows under it. Text extraction is best
+    effort: if a page's text cannot be read, or a link has no rectangle, the link
+    is still returned with an empty title and snippet.
+    """
+    entries = []
+
+    try:
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            for page in pdf_reader.pages:
+                links = get_link_annotations(page)
+                if not links:
+                    continue
+
+                try:
+                    fragments = get_text_fragments(page)
+                except Exception as e:
+                    print(f"Error extracting page text, keeping links without titles: {str(e)}")
+                    fragments = []
+
+                for url, rect in links:
+                    if rect is None or not fragments:
+                        entries.append(PdfLink(url=url))
+                        continue
+
+                    x0, y0, x1, y1 = rect
+                    title = [f for f in fragments
+                             if x0 - RECT_TOLERANCE <= f[0] <= x1 + RECT_TOLERANCE
+                             and y0 - RECT_TOLERANCE <= f[1] <= y1 + RECT_TOLERANCE]
+
+                    # The snippet ends where the next link below this one starts
+                    below = [other[3] for _, other in links if other is not None and other[3] < y0 - RECT_TOLERANCE]
+                    snippet_bottom = max(below + [y0 - SNIPPET_DEPTH])
+                    snippet = [f for f in fragments
+                               if snippet_bottom < f[1] < y0 - RECT_TOLERANCE and f[0] >= x0 - RECT_TOLERANCE]
+
+                    entries.append(PdfLink(url=url, title=join_fragments(title), snippet=join_fragments(snippet)))
+
+    except Exception as e:
+        print(f"Error processing PDF: {str(e)}")
+
+    return entries
+
+
+def sorted_rect(rect):
+    """Normalize a PDF /Rect to (x0, y0, x1, y1) with x0 <= x1 and y0 <= y1."""
+    x0, y0, x1, y1 = (float(v) for v in rect)
+    return min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)
+
+
 def extract_links_from_pdf(file_path):
     links = []
     
@@ -40,18 +177,10 @@ def extract_links_from_pdf(file_path):
         with open(file_path, 'rb') as file:
             pdf_reader = PyPDF2.PdfReader(file)
             for page in pdf_reader.pages:
-                if '/Annots' in page:
-                    annotations = page['/Annots']
-                    if hasattr(annotations, "get_object"):
-                        annotations = annotations.get_object()
-                    
-                    for annotation in annotations:
-                        if hasattr(annotation, "get_object"):
-                            annotation = annotation.get_object()
-                        
-                        if annotation.get('/Subtype', '') == '/Link':
-                            if '/A' in annotation and '/URI' in annotation['/A']:
-                                links.append(annotation['/A']['/URI'])
+                for annotation in get_annotations(page):
+                    if annotation.get('/Subtype', '') == '/Link':
+                        if '/A' in annotation and '/URI' in annotation['/A']:
+                            links.append(annotation['/A']['/URI'])
                 
         return links
         
@@ -72,6 +201,27 @@ def filter_article_links(links):
             
     return unique_articles
 
+
+def filter_article_entries(entries: List[PdfLink]) -> List[PdfLink]:
+    """
+    Resolve PdfLink entries to direct article URLs, dropping non-article links.
+
+    Duplicates are removed keeping the first occurrence; a later duplicate only
+    fills in a title or snippet the first one is missing.
+    """
+    articles = {}
+    for entry in entries:
+        article_url = extract_article_url(entry.url)
+        if not article_url:
+            continue
+        existing = articles.get(article_url)
+        if existing is None:
+            articles[article_url] = PdfLink(url=article_url, title=entry.title, snippet=entry.snippet)
+        else:
+            existing.title = existing.title or entry.title
+            existing.snippet = existing.snippet or entry.snippet
+    return list(articles.values())
+
 def main():
     links = extract_links_from_pdf(r"data\Jan 31 Google Alert  Daily Digest.pdf")
     filtered = filter_article_links(links)
@@ -0,0 +1,241 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from newsletter_model import ArticleInsight, Newsletter, parse_insights
+from prompt_builder import build_category_synthesis_prompt, build_overview_prompt
+from selection_criteria import OTHER_CATEGORY, assign_category, parse_categories
+
+SECTION_MAX_TOKENS = 2500
+OVERVIEW_MAX_TOKENS = 400
+DEFAULT_MAX_WORKERS = 4
+# Larger groups are split into batches so that each call keeps roughly the per-article
+# output budget of a single full synthesis (5000 tokens for up to 20 articles)
+MAX_SECTION_ARTICLES = 10
+
+# Submits a zero-argument LLM call for execution, e.g. to a shared rate-limited scheduler
+Submit = Callable[[Callable[[], Any]], Future]
+
+
+def run_call(fn: Callable[[], Any], submit: Optional[Submit] = None):
+    """Run one LLM call, through submit if given and directly otherwise."""
+    return submit(fn).result() if submit else fn()
+
+
+def group_summaries_by_category(user_profile: str,
+                                summaries: List[Tuple[str, str]]) -> Dict[str, List[Tuple[str, str]]]:
+    """
+    Group (url, summary) pairs by the best matching category of the selection criteria profile.
+
+    Categories keep the order in which they appear in the profile; summaries that
+    match no category (or all summaries, if the profile defines no categories)
+    are grouped under OTHER_CATEGORY, which always comes last.
+    """
+    categories = parse_categories(user_profile)
+    groups = {category.name: [] for category in categories}
+    groups[OTHER_CATEGORY] = []
+
+    for url, summary in summaries:
+        category = assign_category(summary, categories)
+        groups[category.name if category else OTHER_CATEGORY].append((url, summary))
+
+    return {name: items for name, items in groups.items() if items}
+
+
+def batch_groups(groups: Dict[str, List[Tuple[str, str]]],
+                 batch_size: int = MAX_SECTION_ARTICLES) -> List[Tuple[str, List[Tuple[str, str]]]]:
+    """
+    Split each category group into batches of at most batch_size summaries.
+
+    This matters most for profiles without "Category N." sections, where every
+    summary lands in OTHER_CATEGORY and would otherwise go into a single call.
+
+    Returns:
+        list: (category, batch) pairs in the order of groups
+    """
+    return [(category, group[start:start + batch_size])
+            for category, group in groups.items()
+            for start in range(0, len(group), batch_size)]
+
+
+def merge_sections(sections: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """Join the texts of consecutive batches of the same category into one section."""
+    merged = []
+    for category, text in sections:
+        if merged and merged[-1][0] == category:
+            merged[-1] = (category, f"{merged[-1][1].strip()}\n\n{text.strip()}")
+        else:
+            merged.append((category, text))
+    return merged
+
+
+def extract_takeaways(section: str) -> str:
+    """Keep only the takeaway lines of a synthesized section, for the overview pass."""
+    lines = [line.strip() for line in section.splitlines()]
+    return '\n'.join(line for line in lines if 'takeaway' in line.lower())
+
+
+def run_batches(llm, user_profile, batches, structured=False, max_workers=DEFAULT_MAX_WORKERS,
+                submit: Optional[Submit] = None):
+    """
+    Run one synthesis call per (category, batch) pair concurrently.
+
+    With submit, every call is handed to it (so a shared scheduler controls the
+    concurrency); otherwise a local pool of max_workers threads runs them.
+
+    Returns:
+        list: LLMResponse objects in the order of batches
+    """
+    def synthesize_batch(category, group):
+        prompt = build_category_synthesis_prompt(user_profile, category, group, structured=structured)
+        return llm.generate_response(prompt.user, system_prompt=prompt.system, json_mode=structured,
+                                     max_tokens=SECTION_MAX_TOKENS, temperature=0.4)
+
+    if submit:
+        futures = [submit(lambda category=category, group=group: synthesize_batch(category, group))
+                   for category, group in batches]
+        return [future.result() for future in futures]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda batch: synthesize_batch(*batch), batches))
+
+
+def synthesize_sections(llm, user_profile, groups, structured=False, max_workers=DEFAULT_MAX_WORKERS,
+                        submit: Optional[Submit] = None):
+    """
+    Run one synthesis call per batch of each category group concurrently.
+
+    Returns:
+        list: (category, response text) pairs in the order of groups; a category
+        split into several batches appears once per batch
+    """
+    batches = batch_groups(groups)
+    responses = run_batches(llm, user_profile, batches, structured=structured, max_workers=max_workers,
+                            submit=submit)
+    return [(category, response.text) for (category, _), response in zip(batches, responses)]
+
+
+def parse_section(response) -> List[ArticleInsight]:
+    """
+    Parse a structured section response.
+
+    Raises:
+        ValueError: If the response was truncated or is not a JSON object
+    """
+    if (response.metadata or {}).get('finish_reason') == 'length':
+        raise ValueError("response was truncated")
+    return parse_insights(response.text)
+
+
+def fallback_insights(category, group) -> List[ArticleInsight]:
+    """Keep articles whose synthesis failed, with their summary as the insight."""
+    return [ArticleInsight(title=url, url=url, category=category, takeaway='', insight=summary.strip(),
+                           rationale={})
+            for url, summary in group]
+
+
+def synthesize_insights(llm, user_profile, groups, max_workers=DEFAULT_MAX_WORKERS,
+                        submit: Optional[Submit] = None) -> List[ArticleInsight]:
+    """
+    Structured synthesis of all category batches.
+
+    A batch whose reply is truncated or not valid JSON is split in half and the
+    halves are retried, so a long reply costs a retry rather than the articles.
+    A single article that still fails is kept with its summary as the insight.
+
+    Returns:
+        list: ArticleInsight records in the order of groups
+    """
+    # Each slot is (category, batch, insights); insights is None until the batch succeeded
+    slots = [(category, group, None) for category, group in batch_groups(groups)]
+    while True:
+        pending = [idx for idx, (_, _, insights) in enumerate(slots) if insights is None]
+        if not pending:
+            break
+        responses = run_batches(llm, user_profile, [slots[idx][:2] for idx in pending], structured=True,
+                                max_workers=max_workers, submit=submit)
+        retried = {}
+        for idx, response in zip(pending, responses):
+            category, group, _ = slots[idx]
+            try:
+                slots[idx] = (category, group, parse_section(response))
+            except ValueError as e:
+                if len(group) > 1:
+                    print(f"Retrying category {category} in two halves: {str(e)}")
+                    half = len(group) // 2
+                    retried[idx] = [(category, group[:half], None), (category, group[half:], None)]
+                else:
+                    print(f"Keeping the summary for {group[0][0]}: {str(e)}")
+                    slots[idx] = (category, group, fallback_insights(category, group))
+        slots = [new for idx, slot in enumerate(slots) for new in retried.get(idx, [slot])]
+
+    insights = []
+    for category, _, section in slots:
+        for insight in section:
+            insight.category = insight.category or category
+        insights.extend(section)
+    return insights
+
+
+def write_overview(llm, user_profile, takeaways, submit: Optional[Submit] = None):
+    """Run the short executive overview pass over the takeaways of all sections."""
+    prompt = build_overview_prompt(user_profile, takeaways)
+    response = run_call(lambda: llm.generate_response(prompt.user, system_prompt=prompt.system,
+                                                      max_tokens=OVERVIEW_MAX_TOKENS, temperature=0.4), submit)
+    return response.text.strip()
+
+
+def synthesize_hierarchically(llm, user_profile, summaries, include_overview=True,
+                              max_workers=DEFAULT_MAX_WORKERS, submit: Optional[Submit] = None):
+    """
+    Synthesize the newsletter one category at a time.
+
+    Summaries are grouped by category, each group is synthesized by a separate
+    LLM call (run concurrently, through submit if given), and the sections are
+    assembled in profile order.
+    Each call only sees its own group, split into batches of at most
+    MAX_SECTION_ARTICLES, so neither the context window nor the output token
+    limit grows with the total number of articles. An optional short
+    final pass writes an executive overview from the section takeaways.
+
+    Returns:
+        str: The newsletter as markdown
+    """
+    groups = group_summaries_by_category(user_profile, summaries)
+    if not groups:
+        return ''
+
+    sections = merge_sections(synthesize_sections(llm, user_profile, groups, max_workers=max_workers,
+                                                  submit=submit))
+    body = '\n\n'.join(f"# {category}\n\n{text.strip()}" for category, text in sections)
+
+    if not include_overview:
+        return body
+
+    takeaways = '\n\n'.join(f"## {category}\n{extract_takeaways(text)}" for category, text in sections)
+    overview = write_overview(llm, user_profile, takeaways, submit=submit)
+    return f"# Executive Overview\n\n{overview}\n\n{body}"
+
+
+def synthesize_newsletter_hierarchically(llm, user_profile, summaries, include_overview=True,
+                                         max_workers=DEFAULT_MAX_WORKERS, submit: Optional[Submit] = None):
+    """
+    Structured variant of synthesize_hierarchically.
+
+    Each category call returns JSON article records, which are concatenated in
+    profile order (see synthesize_insights for how failed batches are retried);
+    the overview pass reads the takeaways straight from the records.
+
+    Returns:
+        Newsletter: The synthesized newsletter
+    """
+    groups = group_summaries_by_category(user_profile, summaries)
+    if not groups:
+        return Newsletter()
+
+    insights = synthesize_insights(llm, user_profile, groups, max_workers=max_workers, submit=submit)
+
+    newsletter = Newsletter(insights=insights)
+    if include_overview and insights:
+        takeaways = '\n'.join(f"- [{insight.category}] {insight.takeaway}" for insight in insights)
+        newsletter.overview = write_overview(llm, user_profile, takeaways, submit=submit)
+    return newsletter
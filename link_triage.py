@@ -0,0 +1,68 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from extract_links import PdfLink
+from selection_criteria import STOPWORDS, TOKEN_PATTERN, Category, parse_categories, score_category
+
+# Links scoring below this are skipped before any fetch or LLM call; 0 disables triage.
+# Triage is opt-in: a PDF title and snippet are a weak signal, and relevant articles whose
+# headline shares no words with the profile (e.g. "How artificial intelligence is transforming
+# the lives of hearing impaired...") would be dropped. Raising the threshold saves fetches and
+# LLM calls at the cost of such misses.
+DEFAULT_TRIAGE_THRESHOLD = 0
+
+
+@dataclass
+class TriageResult:
+    """The lexical relevance of a link to the user profile."""
+    link: PdfLink
+    score: int
+    category: Optional[str] = None
+
+
+def profile_category(profile: str) -> Category:
+    """Fallback for profiles without "Category N." sections: treat all profile words as one category's terms."""
+    tokens = TOKEN_PATTERN.findall(profile.lower())
+    return Category(name='Profile', keywords=sorted({t for t in tokens if len(t) > 3 and t not in STOPWORDS}))
+
+
+def score_link(link: PdfLink, categories: List[Category]) -> TriageResult:
+    """Score a link's title and snippet against each category and keep the best match."""
+    best = TriageResult(link=link, score=0)
+    for category in categories:
+        score = score_category(link.text, category)
+        if score > best.score:
+            best = TriageResult(link=link, score=score, category=category.name)
+    return best
+
+
+def triage_links(links: List[PdfLink], profile: str,
+                 threshold: int = DEFAULT_TRIAGE_THRESHOLD) -> Tuple[List[TriageResult], List[TriageResult]]:
+    """
+    Split links into those worth fetching and those to skip, using only the
+    anchor text and snippet from the PDF.
+
+    Links without any text cannot be judged and are always kept.
+
+    Returns:
+        tuple: (kept, skipped) lists of TriageResult; kept is ordered by descending score
+    """
+    categories = parse_categories(profile) or [profile_category(profile)]
+    kept, skipped = [], []
+    for link in links:
+        result = score_link(link, categories)
+        if threshold <= 0 or not link.text or result.score >= threshold:
+            kept.append(result)
+        else:
+            skipped.append(result)
+    kept.sort(key=lambda result: result.score, reverse=True)
+    return kept, skipped
+
+
+def format_triage_report(skipped: List[TriageResult]) -> str:
+    """Markdown list of the skipped links with their score, for display to the user."""
+    lines = []
+    for result in skipped:
+        title = result.link.title or result.link.url
+        lines.append(f"- [{title}]({result.link.url}) (score {result.score})")
+    return '\n'.join(lines)
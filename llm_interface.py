@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List
 import openai
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import json
 import random
+import re
+import threading
+import time
 
 @dataclass
 class LLMResponse:
@@ -11,8 +15,54 @@ class LLMResponse:
     raw_response: Any  # Original response from the LLM
     metadata: Optional[Dict[str, Any]] = None
 
+@dataclass
+class UsageStats:
+    """Running token and latency totals for an LLM instance, including provider-side prompt cache hits."""
+    requests: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    latency_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, metadata: Dict[str, Any]):
+        """Add the usage figures from a response's metadata to the totals."""
+        with self._lock:
+            self.requests += 1
+            self.prompt_tokens += metadata.get('prompt_tokens') or 0
+            self.cached_tokens += metadata.get('cached_tokens') or 0
+            self.completion_tokens += metadata.get('completion_tokens') or 0
+            self.latency_seconds += metadata.get('latency_seconds') or 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the totals together with the share of prompt tokens served from cache."""
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'prompt_tokens': self.prompt_tokens,
+                'cached_tokens': self.cached_tokens,
+                'completion_tokens': self.completion_tokens,
+                'latency_seconds': round(self.latency_seconds, 3),
+                'uncached_prompt_tokens': self.prompt_tokens - self.cached_tokens,
+                'cache_hit_ratio': round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else 0.0,
+            }
+
+def build_messages(prompt: str, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    Build a chat message list. The system prompt goes first so that it forms a
+    stable, cacheable prefix ahead of the per-call user content.
+    """
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
 class LLMInterface(ABC):
     """Abstract base class for LLM implementations."""
+
+    # Whether the provider serves repeated prompt prefixes from a cache at a discount
+    supports_prompt_caching = False
     
     @abstractmethod
     def initialize(self, **kwargs):
@@ -21,7 +71,13 @@ class LLMInterface(ABC):
     
     @abstractmethod
     def generate_response(self, prompt: str, **kwargs) -> LLMResponse:
-        """Generate a response for the given prompt."""
+        """
+        Generate a response for the given prompt.
+
+        Implementations accept an optional `system_prompt` keyword argument that
+        is sent ahead of the prompt as a separate system message, and a
+        `json_mode` flag that constrains the response to a JSON object.
+        """
         pass
     
     @abstractmethod
@@ -34,6 +90,7 @@ class MockLLM(LLMInterface):
     
     def __init__(self):
         self.initialized = False
+        self.usage = UsageStats()
         self.mock_responses = [
             "This article discusses advancements in artificial intelligence and its applications in various industries. "
             "The content emphasizes the importance of responsible AI development and ethical considerations. "
@@ -59,14 +116,22 @@ class MockLLM(LLMInterface):
         
         # Randomly select a pre-written response
         response_text = random.choice(self.mock_responses)
+        if kwargs.get('json_mode'):
+            response_text = self._mock_json_response(prompt, response_text)
         
         # Create metadata dictionary
+        prompt_chars = len(prompt) + len(kwargs.get('system_prompt') or '')
         metadata = {
             'model': 'mock-llm',
             'temperature': kwargs.get('temperature', 0.7),
             'max_tokens': kwargs.get('max_tokens', 150),
-            'finish_reason': 'mock_complete'
+            'finish_reason': 'mock_complete',
+            'prompt_tokens': prompt_chars // 4,
+            'cached_tokens': 0,
+            'completion_tokens': len(response_text) // 4,
+            'latency_seconds': 0.0
         }
+        self.usage.record(metadata)
         
         return LLMResponse(
             text=response_text,
@@ -74,10 +139,28 @@ class MockLLM(LLMInterface):
             metadata=metadata
         )
     
+    def _mock_json_response(self, prompt: str, text: str) -> str:
+        """Build a JSON response with one mock article per URL in the prompt."""
+        urls = re.findall(r'^URL: (\S+)', prompt, re.MULTILINE) or ['']
+        articles = [{
+            'title': f'Mock article {idx+1}',
+            'url': url,
+            'category': 'Other',
+            'takeaway': text.split('. ')[0],
+            'insight': text,
+            'rationale': {'Emerging trends': 'Mock trend.', 'Potential risks': 'Mock risk.'}
+        } for idx, url in enumerate(urls)]
+        if len(articles) == 1 and not articles[0]['url']:
+            return json.dumps(articles[0])
+        return json.dumps({'articles': articles})
+    
     def validate_credentials(self) -> bool:
         """Mock validation - always returns True."""
         return True
 
+# OpenAI applies prompt caching automatically for these model families (prefixes of 1024+ tokens)
+PROMPT_CACHING_MODEL_PREFIXES = ('gpt-4o', 'gpt-4.1', 'o1', 'o3', 'o4')
+
 class ChatGPTLLM(LLMInterface):
     """Concrete implementation of LLMInterface for ChatGPT."""
     
@@ -85,7 +168,12 @@ class ChatGPTLLM(LLMInterface):
         self.api_key = api_key
         self.model = model
         self.client = None
+        self.usage = UsageStats()
     
+    @property
+    def supports_prompt_caching(self) -> bool:
+        return self.model.startswith(PROMPT_CACHING_MODEL_PREFIXES)
+
     def initialize(self, **kwargs):
         """Initialize the OpenAI client with API key."""
         self.api_key = kwargs.get('api_key', self.api_key)
@@ -104,25 +192,39 @@ class ChatGPTLLM(LLMInterface):
             # Get optional parameters with defaults
             temperature = kwargs.get('temperature', 0.3)
             max_tokens = kwargs.get('max_tokens', 300)
+            messages = build_messages(prompt, kwargs.get('system_prompt'))
+            request_options = {}
+            if kwargs.get('json_mode'):
+                request_options['response_format'] = {"type": "json_object"}
             
             # Create the ChatGPT request
+            start = time.perf_counter()
             response = self.client.chat.completions.create(
                 model=self.model,
-                messages=[{"role": "user", "content": prompt}],
+                messages=messages,
                 temperature=temperature,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                **request_options
             )
+            latency = time.perf_counter() - start
             
             # Extract the response text
             response_text = response.choices[0].message.content
             
             # Create metadata dictionary
+            usage = getattr(response, 'usage', None)
+            prompt_details = getattr(usage, 'prompt_tokens_details', None)
             metadata = {
                 'model': self.model,
                 'temperature': temperature,
                 'max_tokens': max_tokens,
-                'finish_reason': response.choices[0].finish_reason
+                'finish_reason': response.choices[0].finish_reason,
+                'prompt_tokens': getattr(usage, 'prompt_tokens', 0),
+                'cached_tokens': getattr(prompt_details, 'cached_tokens', 0) or 0,
+                'completion_tokens': getattr(usage, 'completion_tokens', 0),
+                'latency_seconds': latency
             }
+            self.usage.record(metadata)
             
             return LLMResponse(
                 text=response_text,
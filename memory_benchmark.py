@@ -0,0 +1,176 @@
+import argparse
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from concurrent.futures import as_completed
+from contextlib import contextmanager
+
+import extract_content
+from llm_interface import LLMFactory
+from prompt_builder import build_synthesis_prompt
+from shared_service import PipelineService
+from summary_store import SummaryStore
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+WORDS = ('generative', 'enterprise', 'agents', 'model', 'inference', 'latency', 'customer',
+         'platform', 'training', 'deployment', 'cost', 'multimodal', 'benchmark', 'open-source')
+
+
+def synthetic_article_html(idx, paragraphs=80, boilerplate_kb=96):
+    """Build an article page with realistic proportions of markup, scripts and text."""
+    rng = random.Random(idx)
+    body = '\n'.join(
+        f"<p>{' '.join(rng.choice(WORDS) for _ in range(60))}.</p>" for _ in range(paragraphs)
+    )
+    script = '<script>' + 'var x=1;' * (boilerplate_kb * 128) + '</script>'
+    nav = '<nav>' + ''.join(f'<a href="/section/{i}">Section {i}</a>' for i in range(200)) + '</nav>'
+    return (f"<html><head><title>Article {idx}</title>{script}</head><body>{nav}"
+            f"<article><h1>Article {idx}</h1>{body}</article><footer>Footer</footer></body></html>")
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def current_rss_mb():
+    """Current resident set size of this process in MB, falling back to the peak where unavailable."""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * resource.getpagesize() / (1024 * 1024)
+    except (OSError, AttributeError, IndexError, ValueError):
+        return peak_rss_mb()
+
+
+class StubbedResponse:
+    """A streamed text/html response serving a synthetic article, standing in for requests.Response."""
+
+    def __init__(self, html):
+        self.headers = {'Content-Type': 'text/html; charset=utf-8'}
+        self.encoding = 'utf-8'
+        self._body = html.encode('utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._body = None
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self._body), chunk_size):
+            yield self._body[start:start + chunk_size]
+
+
+@contextmanager
+def stubbed_fetch():
+    """Serve https://example.com/article-N from synthetic_article_html(N) instead of the network."""
+    original = extract_content.requests.get
+
+    def get(url, **kwargs):
+        return StubbedResponse(synthetic_article_html(int(url.rsplit('-', 1)[1])))
+
+    extract_content.requests.get = get
+    try:
+        yield
+    finally:
+        extract_content.requests.get = original
+
+
+def run_pipeline(service, articles, profile, in_memory=False, first_article=0):
+    """
+    Fetch (through fetch_html's streaming path), extract, (mock) summarize and
+    assemble the synthesis prompt for synthetic articles, submitting every link
+    to the shared PipelineService and collecting results as app.py does.
+    """
+    llm = LLMFactory.create_llm("mock")
+    summaries = [] if in_memory else SummaryStore()
+    try:
+        with stubbed_fetch():
+            pending = [service.summarize_link('benchmark', llm, f"https://example.com/article-{idx}", profile)
+                       for idx in range(first_article, first_article + articles)]
+            for future in as_completed(pending):
+                result = future.result()
+                if result:
+                    summaries.append(result)
+
+        prompt = build_synthesis_prompt(profile, summaries)
+        return len(prompt.user)
+    finally:
+        if not in_memory:
+            summaries.close()
+
+
+def measure(service, articles, profile, in_memory=False, first_article=0):
+    """
+    Run the pipeline once under tracemalloc (which must be started).
+
+    Returns:
+        tuple: (elapsed seconds, peak traced bytes of this run, peak RSS of the process in MB or None)
+    """
+    gc.collect()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    run_pipeline(service, articles, profile, in_memory=in_memory, first_article=first_article)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    return elapsed, peak, peak_rss_mb()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure peak memory of the article processing pipeline')
+    parser.add_argument('--articles', '-n', type=int, default=300, help='Number of synthetic articles')
+    parser.add_argument('--in-memory', action='store_true',
+                        help='Keep summaries in a list instead of the disk-backed store')
+    args = parser.parse_args()
+
+    profile = "Category 1. Enterprise Autonomous AI Agents\nKeywords: Autonomous agents, enterprise AI"
+
+    # Worker threads, imports and parser code paths count towards the baseline, not the runs
+    service = PipelineService()
+    run_pipeline(service, 1, profile, in_memory=args.in_memory)
+    gc.collect()
+    baseline_rss = current_rss_mb()
+
+    # Per-article growth is the slope between a run over half the articles and one over all of
+    # them: the fixed cost (interpreter, imports, one page's parse) cancels out of the difference
+    half = max(1, args.articles // 2)
+    tracemalloc.start()
+    # Distinct articles per run, so the service's summary cache cannot serve the second run
+    _, half_peak, half_rss = measure(service, half, profile, in_memory=args.in_memory, first_article=1)
+    elapsed, peak, rss = measure(service, args.articles, profile, in_memory=args.in_memory,
+                                 first_article=1 + half)
+    tracemalloc.stop()
+
+    print(f"Articles:                     {args.articles}")
+    print(f"Summary storage:              {'in-memory list' if args.in_memory else 'disk-backed store'}")
+    print(f"Elapsed:                      {elapsed:.2f} s")
+    print(f"Peak traced memory:           {peak / (1024 * 1024):.2f} MB")
+    if rss is not None:
+        print(f"Peak RSS (process):           {rss:.2f} MB")
+        print(f"Peak RSS above baseline:      {rss - baseline_rss:.2f} MB")
+
+    if args.articles > half:
+        per_100 = 100 / (args.articles - half)
+        print(f"Traced growth/100 articles:   {(peak - half_peak) * per_100 / (1024 * 1024):.2f} MB")
+        if rss is not None:
+            print(f"RSS growth/100 articles:      {(rss - half_rss) * per_100:.2f} MB")
+    else:
+        print("Per-article growth needs --articles of at least 2")
+
+
+if __name__ == "__main__":
+    main()
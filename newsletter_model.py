@@ -0,0 +1,129 @@
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+RATIONALE_LABELS = [
+    'Emerging trends',
+    'Potential risks',
+    'Applications',
+    'Key statistics or findings',
+    'Actionable recommendations',
+]
+
+# Some models wrap JSON output in a ```json fence even in JSON mode
+JSON_FENCE_PATTERN = re.compile(r'^\s*```(?:json)?\s*(?P<body>.*?)\s*```\s*$', re.DOTALL)
+
+
+@dataclass
+class ArticleInsight:
+    """
+    The key insights extracted for one newsletter article.
+
+    Slotted to keep per-article overhead small when large digests are held in memory.
+    """
+    __slots__ = ('title', 'url', 'category', 'takeaway', 'insight', 'rationale')
+
+    title: str
+    url: str
+    category: str
+    takeaway: str
+    insight: str
+    rationale: Dict[str, str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ArticleInsight':
+        """Build an insight from a decoded JSON object, tolerating missing or mistyped fields."""
+        rationale = data.get('rationale') or {}
+        if isinstance(rationale, list):
+            rationale = {label: str(text) for label, text in zip(RATIONALE_LABELS, rationale)}
+        elif not isinstance(rationale, dict):
+            # Prose rationale: keep it rather than dropping it
+            rationale = {'Rationale': str(rationale)}
+        return cls(
+            title=str(data.get('title') or '').strip(),
+            url=str(data.get('url') or '').strip(),
+            category=str(data.get('category') or '').strip(),
+            takeaway=str(data.get('takeaway') or '').strip(),
+            insight=str(data.get('insight') or '').strip(),
+            rationale={str(k).strip(): str(v).strip() for k, v in rationale.items() if v},
+        )
+
+
+@dataclass
+class Newsletter:
+    """
+    A synthesized newsletter: the selected article insights and an optional executive overview.
+
+    When structured synthesis fails, the newsletter instead carries the free-form
+    markdown produced by the fallback synthesis, and the renderers use that.
+    """
+    insights: List[ArticleInsight] = field(default_factory=list)
+    overview: str = ''
+    title: str = 'Curated Articles for Customer Navigator Letter'
+    markdown: str = ''
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'title': self.title,
+            'overview': self.overview,
+            'articles': [insight.to_dict() for insight in self.insights],
+            'markdown': self.markdown,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Newsletter':
+        newsletter = cls(insights=parse_insight_list(data.get('articles')), overview=data.get('overview') or '',
+                         markdown=data.get('markdown') or '')
+        if data.get('title'):
+            newsletter.title = data['title']
+        return newsletter
+
+
+def load_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """Decode an LLM JSON response, returning None if it is not a JSON object."""
+    fenced = JSON_FENCE_PATTERN.match(text or '')
+    if fenced:
+        text = fenced.group('body')
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def parse_insight_list(articles: Any) -> List[ArticleInsight]:
+    """Convert a list of decoded article objects into insights, dropping entries without a title."""
+    if not isinstance(articles, list):
+        return []
+    insights = [ArticleInsight.from_dict(article) for article in articles if isinstance(article, dict)]
+    return [insight for insight in insights if insight.title]
+
+
+def parse_insights(text: str) -> List[ArticleInsight]:
+    """
+    Parse a structured synthesis response of the form {"articles": [...]}.
+
+    Raises:
+        ValueError: If the response is not a JSON object
+    """
+    data = load_json_object(text)
+    if data is None:
+        raise ValueError("LLM response is not a valid JSON object")
+    return parse_insight_list(data.get('articles'))
+
+
+def parse_insight(text: str) -> ArticleInsight:
+    """
+    Parse a structured single-article summary response.
+
+    Raises:
+        ValueError: If the response is not a JSON object
+    """
+    data = load_json_object(text)
+    if data is None:
+        raise ValueError("LLM response is not a valid JSON object")
+    return ArticleInsight.from_dict(data)
@@ -0,0 +1,177 @@
+import hashlib
+import io
+import json
+import os
+import smtplib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.message import EmailMessage
+from typing import Dict, Iterable, List, Optional
+
+from newsletter_model import Newsletter
+from renderers import render_docx, render_html, render_markdown, render_pdf, render_text
+
+DEFAULT_FORMATS = ('html', 'txt', 'docx')
+DOCX_MIME_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+WRITE_CHUNK_SIZE = 64 * 1024
+
+# Default SMTP endpoint is a local stand-in, e.g. `python -m aiosmtpd -n -l localhost:1025`
+DEFAULT_SMTP_HOST = 'localhost'
+DEFAULT_SMTP_PORT = 1025
+
+
+def docx_bytes(newsletter: Newsletter) -> bytes:
+    doc_io = io.BytesIO()
+    render_docx(newsletter).save(doc_io)
+    return doc_io.getvalue()
+
+
+# format -> (renderer returning bytes, file extension, mime type)
+RENDERERS = {
+    'html': (lambda newsletter: render_html(newsletter).encode('utf-8'), 'html', 'text/html'),
+    'txt': (lambda newsletter: render_text(newsletter).encode('utf-8'), 'txt', 'text/plain'),
+    'md': (lambda newsletter: render_markdown(newsletter).encode('utf-8'), 'md', 'text/markdown'),
+    'docx': (docx_bytes, 'docx', DOCX_MIME_TYPE),
+    'pdf': (render_pdf, 'pdf', 'application/pdf'),
+}
+
+
+@dataclass(frozen=True)
+class RenderedArtifact:
+    """One rendered output file of a newsletter."""
+    format: str
+    filename: str
+    mime_type: str
+    data: bytes
+
+
+class ArtifactCache:
+    """
+    Thread-safe LRU cache of rendered artifacts keyed by content hash and format,
+    so a newsletter is rendered at most once per format however often it is
+    downloaded, saved or sent.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[RenderedArtifact]:
+        with self._lock:
+            artifact = self._entries.get(key)
+            if artifact is not None:
+                self._entries.move_to_end(key)
+            return artifact
+
+    def put(self, key, artifact: RenderedArtifact):
+        with self._lock:
+            self._entries[key] = artifact
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+ARTIFACT_CACHE = ArtifactCache()
+
+
+def content_hash(newsletter: Newsletter) -> str:
+    """Stable hash of the newsletter content, used as the artifact cache key."""
+    payload = json.dumps(newsletter.to_dict(), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def render_all(newsletter: Newsletter, formats: Iterable[str] = DEFAULT_FORMATS,
+               cache: ArtifactCache = ARTIFACT_CACHE, basename: str = 'personalized_summary',
+               max_workers: Optional[int] = None) -> Dict[str, RenderedArtifact]:
+    """
+    Render a newsletter to several formats concurrently, reusing cached artifacts.
+
+    Returns:
+        dict: format -> RenderedArtifact, in the order of formats
+    """
+    formats = list(formats)
+    unknown = [fmt for fmt in formats if fmt not in RENDERERS]
+    if unknown:
+        raise ValueError(f"Unsupported output format(s): {', '.join(unknown)}")
+
+    digest = content_hash(newsletter)
+    artifacts = {fmt: cache.get((digest, basename, fmt)) for fmt in formats}
+    missing = [fmt for fmt, artifact in artifacts.items() if artifact is None]
+
+    def render(fmt):
+        renderer, extension, mime_type = RENDERERS[fmt]
+        artifact = RenderedArtifact(fmt, f"{basename}.{extension}", mime_type, renderer(newsletter))
+        cache.put((digest, basename, fmt), artifact)
+        return artifact
+
+    if missing:
+        with ThreadPoolExecutor(max_workers=max_workers or len(missing)) as executor:
+            for fmt, artifact in zip(missing, executor.map(render, missing)):
+                artifacts[fmt] = artifact
+    return artifacts
+
+
+def write_artifacts(artifacts: Dict[str, RenderedArtifact], directory: str) -> List[str]:
+    """
+    Stream rendered artifacts to files in directory.
+
+    Returns:
+        list: Paths of the written files
+    """
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for artifact in artifacts.values():
+        path = os.path.join(directory, artifact.filename)
+        view = memoryview(artifact.data)
+        with open(path, 'wb') as f:
+            for start in range(0, len(view), WRITE_CHUNK_SIZE):
+                f.write(view[start:start + WRITE_CHUNK_SIZE])
+        paths.append(path)
+    return paths
+
+
+def build_newsletter_email(newsletter: Newsletter, sender: str, subject: Optional[str] = None,
+                           attach_docx: bool = True, cache: ArtifactCache = ARTIFACT_CACHE) -> EmailMessage:
+    """
+    Build the recipient-independent email: plain text and HTML alternatives,
+    optionally with the DOCX attached. Uses the artifact cache for all parts.
+    """
+    formats = ('txt', 'html', 'docx') if attach_docx else ('txt', 'html')
+    artifacts = render_all(newsletter, formats, cache=cache)
+
+    message = EmailMessage()
+    message['Subject'] = subject or newsletter.title
+    message['From'] = sender
+    message.set_content(artifacts['txt'].data.decode('utf-8'))
+    message.add_alternative(artifacts['html'].data.decode('utf-8'), subtype='html')
+    if attach_docx:
+        docx = artifacts['docx']
+        maintype, subtype = docx.mime_type.split('/', 1)
+        message.add_attachment(docx.data, maintype=maintype, subtype=subtype, filename=docx.filename)
+    return message
+
+
+def send_newsletter(newsletter: Newsletter, sender: str, recipients: Iterable[str],
+                    subject: Optional[str] = None, attach_docx: bool = True,
+                    host: str = DEFAULT_SMTP_HOST, port: int = DEFAULT_SMTP_PORT,
+                    cache: ArtifactCache = ARTIFACT_CACHE) -> int:
+    """
+    Send the newsletter to each recipient over a single SMTP connection.
+
+    The message is built once; only the To header changes per recipient.
+
+    Returns:
+        int: Number of messages sent
+    """
+    message = build_newsletter_email(newsletter, sender, subject, attach_docx, cache=cache)
+    sent = 0
+    with smtplib.SMTP(host, port) as smtp:
+        for recipient in recipients:
+            del message['To']
+            message['To'] = recipient
+            smtp.send_message(message)
+            sent += 1
+    return sent
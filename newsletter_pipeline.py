@@ -0,0 +1,51 @@
+from hierarchical_synthesis import run_call, synthesize_hierarchically, synthesize_newsletter_hierarchically
+from newsletter_model import Newsletter, parse_insight, parse_insights
+from prompt_builder import build_summary_prompt, build_synthesis_prompt
+
+
+# Function to process content through LLM
+def summarize_content(llm, content, user_profile, structured=False):
+    # Instructions (and, for models with prompt caching, the profile) form the system
+    # message so that they are a stable, cacheable prefix; only the article content varies.
+    prompt = build_summary_prompt(user_profile, content, structured=structured,
+                                  include_profile=getattr(llm, 'supports_prompt_caching', False))
+
+    response = llm.generate_response(prompt.user, system_prompt=prompt.system, json_mode=structured,
+                                     max_tokens=300, temperature=0.7)
+    if structured:
+        return parse_insight(response.text)
+    return response.text
+
+
+def synthesize_summaries(llm, user_profile, summaries, hierarchical=False, submit=None):
+    # submit, if given, runs each LLM call (e.g. through the shared scheduler); otherwise calls run in this thread
+    if hierarchical:
+        # One concurrent call per category keeps each prompt and output small for large digests
+        return synthesize_hierarchically(llm, user_profile, summaries, submit=submit)
+
+    prompt = build_synthesis_prompt(user_profile, summaries)
+
+    response = run_call(lambda: llm.generate_response(prompt.user, system_prompt=prompt.system,
+                                                      max_tokens=5000, temperature=0.4), submit)
+    return response.text
+
+
+def synthesize_newsletter(llm, user_profile, summaries, hierarchical=False, submit=None):
+    """Structured synthesis: returns a Newsletter of ArticleInsight records instead of markdown."""
+    if hierarchical:
+        return synthesize_newsletter_hierarchically(llm, user_profile, summaries, submit=submit)
+
+    prompt = build_synthesis_prompt(user_profile, summaries, structured=True)
+
+    response = run_call(lambda: llm.generate_response(prompt.user, system_prompt=prompt.system, json_mode=True,
+                                                      max_tokens=5000, temperature=0.4), submit)
+    if (response.metadata or {}).get('finish_reason') == 'length':
+        print('Structured synthesis was truncated, falling back to markdown synthesis')
+    else:
+        try:
+            return Newsletter(insights=parse_insights(response.text))
+        except ValueError as e:
+            print(f"Structured synthesis failed ({str(e)}), falling back to markdown synthesis")
+
+    # Truncated markdown still renders to a usable document, unlike truncated JSON
+    return Newsletter(markdown=synthesize_summaries(llm, user_profile, summaries, submit=submit))
@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+SYNTHESIS_TEMPLATE_PATH = 'prompt.txt'
+ARTICLES_SECTION = '# Articles'
+
+SUMMARY_INSTRUCTIONS = """
+Please provide a concise summary of the content supplied by the user, focusing on aspects that would be most relevant to the user profile.
+
+Please strictly limit the summary to 2-3 paragraphs.
+""".strip()
+
+STRUCTURED_SUMMARY_INSTRUCTIONS = """
+Respond only with a JSON object with the following fields:
+- "title": the title of the article
+- "category": the most relevant category from the user profile
+- "takeaway": a short headline summarizing the key insight
+- "insight": a 2-3 sentence summary of the aspects most relevant to the user profile
+- "rationale": an object with the keys "Emerging trends", "Potential risks", "Applications", "Key statistics or findings" and "Actionable recommendations"
+""".strip()
+
+STRUCTURED_SYNTHESIS_INSTRUCTIONS = """
+# JSON Output
+Instead of a markdown document, respond only with a JSON object of the form {"articles": [...]}, listing the selected articles in order of importance. Each article is an object with the following fields:
+- "title": the title of the article in sentence case
+- "url": the URL of the article exactly as given
+- "category": the relevant category
+- "takeaway": the takeaway headline, without markdown
+- "insight": the 2-3 key insight sentences, without markdown
+- "rationale": an object with the keys "Emerging trends", "Potential risks", "Applications", "Key statistics or findings" and "Actionable recommendations"
+""".strip()
+
+OVERVIEW_INSTRUCTIONS = """
+You are writing the executive overview for a curated newsletter on generative AI for the reader described by the selection criteria below. The user will supply the takeaways of every article in the newsletter, grouped by category.
+
+Write a markdown executive overview of at most 5 bullet points that captures the most important cross-category themes and what the reader should act on. Do not repeat article titles or add a heading.
+""".strip()
+
+
+@dataclass(frozen=True)
+class PromptParts:
+    """
+    A prompt split into a stable prefix and the per-call content.
+
+    The system part holds the static instructions and the user profile, and is
+    byte-identical across calls for the same profile, so the provider can serve
+    it from its prompt-prefix cache. The user part holds the variable content.
+    """
+    system: str
+    user: str
+
+
+@lru_cache(maxsize=None)
+def load_template(path: str) -> str:
+    """Read a prompt template once per process."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def build_summary_prompt(user_profile: str, content: str, structured: bool = False,
+                         include_profile: bool = False) -> PromptParts:
+    """
+    Build the prompt for summarizing a single article.
+
+    The profile is only sent when include_profile is set, i.e. for models that
+    serve the repeated system prefix from the provider's prompt cache: a full
+    selection criteria profile is ~1.5k tokens, which would otherwise be paid
+    in full on every article. With structured=True the model is asked for a
+    JSON object with the ArticleInsight fields instead of free-form paragraphs;
+    it needs the profile to pick a category, so the profile is always sent.
+    """
+    instructions = f"{SUMMARY_INSTRUCTIONS}\n\n{STRUCTURED_SUMMARY_INSTRUCTIONS}" if structured else SUMMARY_INSTRUCTIONS
+    if structured or include_profile:
+        return PromptParts(system=f"{instructions}\n\n# User Profile\n{user_profile.strip()}", user=content)
+    return PromptParts(system=instructions, user=content)
+
+
+def format_articles(summaries: Iterable[Tuple[str, str]]) -> str:
+    """Format (url, summary) pairs as the numbered article list used by the synthesis prompt."""
+    return '\n'.join(
+        f"## Article {idx+1}\nURL: {url}\n{summary}" for idx, (url, summary) in enumerate(summaries)
+    )
+
+
+def build_synthesis_prompt(user_profile: str, summaries: Iterable[Tuple[str, str]],
+                           template_path: str = SYNTHESIS_TEMPLATE_PATH, structured: bool = False) -> PromptParts:
+    """
+    Build the newsletter synthesis prompt from the template.
+
+    Everything before the "# Articles" section of the template (instructions and
+    the {profile} placeholder) becomes the system message; the articles section
+    becomes the user message. With structured=True the JSON output instructions
+    are appended to the system message.
+    """
+    template = load_template(template_path)
+    static, found, articles_section = template.partition(ARTICLES_SECTION)
+    if not found:
+        raise ValueError(f"Prompt template {template_path} has no '{ARTICLES_SECTION}' section")
+
+    system = static.replace('{profile}', user_profile.strip()).strip()
+    if structured:
+        system = f"{system}\n\n{STRUCTURED_SYNTHESIS_INSTRUCTIONS}"
+    user = (ARTICLES_SECTION + articles_section).replace('{articles}', format_articles(summaries)).strip()
+    return PromptParts(system=system, user=user)
+
+
+def build_category_synthesis_prompt(user_profile: str, category: str, summaries: Iterable[Tuple[str, str]],
+                                    template_path: str = SYNTHESIS_TEMPLATE_PATH,
+                                    structured: bool = False) -> PromptParts:
+    """
+    Build the synthesis prompt for one category section of a hierarchical synthesis.
+
+    The system message is the same as for a full synthesis, so all category calls
+    share one cached prefix; the category name is given in the user message.
+    """
+    prompt = build_synthesis_prompt(user_profile, summaries, template_path, structured)
+    note = (f'All of the following articles were pre-assigned to the category "{category}". '
+            f'Use this as the category unless an article clearly fits another one better.')
+    return PromptParts(system=prompt.system, user=f"{note}\n\n{prompt.user}")
+
+
+def build_overview_prompt(user_profile: str, takeaways: str) -> PromptParts:
+    """
+    Build the prompt for the short executive overview pass over the assembled sections.
+    """
+    system = f"{OVERVIEW_INSTRUCTIONS}\n\n# Detailed Selection Criteria\n{user_profile.strip()}"
+    return PromptParts(system=system, user=takeaways)
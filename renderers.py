@@ -0,0 +1,260 @@
+import html
+import re
+from typing import Iterable
+
+from docx import Document
+from fpdf import FPDF
+
+from GenerateWordDocument import add_formatted_text, add_hyperlink, generate_word_doc_from_markdown
+from newsletter_model import Newsletter
+
+MARKDOWN_INLINE_PATTERN = re.compile(r"\*\*(?P<bold>.+?)\*\*|\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)]+)\)")
+
+# The built-in PDF fonts only cover Latin-1; typographic punctuation is mapped to ASCII first
+PDF_TRANSLATION = str.maketrans({
+    '\u2018': "'", '\u2019': "'", '\u201c': '"', '\u201d': '"', '\u2013': '-', '\u2014': '-',
+    '\u2022': '-', '\u2026': '...', '\u00a0': ' ',
+})
+PDF_FONT = 'helvetica'
+PDF_FONT_SIZE = 11
+PDF_LINE_HEIGHT = 6
+PDF_MARGIN = 20
+PDF_BULLET_INDENT = 6
+PDF_HEADING_SIZES = {1: 18, 2: 14}
+
+
+def render_markdown(newsletter: Newsletter) -> str:
+    """
+    Render a newsletter as markdown, in the same layout the synthesis prompt
+    produces in free-form mode.
+    """
+    if newsletter.markdown:
+        return newsletter.markdown
+
+    lines = [f"# {newsletter.title}", ""]
+    if newsletter.overview:
+        lines += ["## Executive Overview", newsletter.overview.strip(), ""]
+
+    for insight in newsletter.insights:
+        heading = f"[{insight.title}]({insight.url})" if insight.url else insight.title
+        lines += [
+            f"## {heading}",
+            f"**Category:** {insight.category}  ",
+            f"**Takeaway:** **{insight.takeaway}:**  ",
+            insight.insight,
+            "",
+        ]
+        if insight.rationale:
+            lines.append("**Rationale:**  ")
+            lines += [f"- **{label}:** {text}" for label, text in insight.rationale.items()]
+            lines.append("")
+    return '\n'.join(lines)
+
+
+def strip_markdown(text: str) -> str:
+    """Remove bold markers and turn [text](url) links into "text (url)"."""
+    def replace(match):
+        if match.group('bold'):
+            return match.group('bold')
+        return f"{match.group('link_text')} ({match.group('link_url')})"
+    return MARKDOWN_INLINE_PATTERN.sub(replace, text)
+
+
+def render_text(newsletter: Newsletter) -> str:
+    """Render a newsletter as plain text, e.g. for the text part of an email."""
+    if newsletter.markdown:
+        return '\n'.join(strip_markdown(line.lstrip('#').strip()) for line in newsletter.markdown.splitlines())
+
+    lines = [newsletter.title, "=" * len(newsletter.title), ""]
+    if newsletter.overview:
+        lines += ["Executive Overview", "-" * 18, strip_markdown(newsletter.overview.strip()), ""]
+
+    for insight in newsletter.insights:
+        lines += [insight.title, "-" * len(insight.title)]
+        if insight.url:
+            lines.append(insight.url)
+        lines += [
+            f"Category: {insight.category}",
+            f"Takeaway: {insight.takeaway}",
+            insight.insight,
+        ]
+        if insight.rationale:
+            lines.append("Rationale:")
+            lines += [f"  * {label}: {text}" for label, text in insight.rationale.items()]
+        lines.append("")
+    return '\n'.join(lines)
+
+
+def markdown_inline_to_html(text: str) -> str:
+    """Escape text and convert inline **bold** and [text](url) markdown to HTML."""
+    parts = []
+    pos = 0
+    for match in MARKDOWN_INLINE_PATTERN.finditer(text):
+        parts.append(html.escape(text[pos:match.start()]))
+        if match.group('bold'):
+            # Bold text may wrap a link, as in the free-form synthesis layout
+            parts.append(f"<strong>{markdown_inline_to_html(match.group('bold'))}</strong>")
+        else:
+            parts.append(f'<a href="{html.escape(match.group("link_url"))}" style="color:#1a5fb4;">'
+                         f'{html.escape(match.group("link_text"))}</a>')
+        pos = match.end()
+    parts.append(html.escape(text[pos:]))
+    return ''.join(parts)
+
+
+def render_markdown_html(markdown: str) -> Iterable[str]:
+    """Render simple markdown (headings, bullets and paragraphs) as HTML fragments."""
+    bullets = []
+    for line in markdown.splitlines():
+        stripped = line.strip()
+        if stripped.startswith(("- ", "* ", "+ ")):
+            bullets.append(f"<li>{markdown_inline_to_html(stripped[2:].strip())}</li>")
+            continue
+        if bullets:
+            yield f"<ul>{''.join(bullets)}</ul>"
+            bullets = []
+        if stripped.startswith("#"):
+            level = min(len(stripped) - len(stripped.lstrip("#")), 6)
+            size = 24 if level == 1 else 18
+            yield (f'<h{level} style="font-size:{size}px;color:#333;margin:24px 0 8px;">'
+                   f'{markdown_inline_to_html(stripped[level:].strip())}</h{level}>')
+        elif stripped:
+            yield f'<p style="margin:0 0 12px;">{markdown_inline_to_html(stripped)}</p>'
+    if bullets:
+        yield f"<ul>{''.join(bullets)}</ul>"
+
+
+def render_html(newsletter: Newsletter) -> str:
+    """
+    Render a newsletter as an HTML email body. Styles are inlined because most
+    email clients ignore <style> blocks.
+    """
+    if newsletter.markdown:
+        body = list(render_markdown_html(newsletter.markdown))
+    else:
+        body = [f'<h1 style="font-size:24px;color:#222;margin:0 0 16px;">{html.escape(newsletter.title)}</h1>']
+    if newsletter.overview:
+        body.append('<h2 style="font-size:18px;color:#333;margin:24px 0 8px;">Executive Overview</h2>')
+        body.extend(render_markdown_html(newsletter.overview))
+
+    for insight in newsletter.insights:
+        title = html.escape(insight.title)
+        if insight.url:
+            title = f'<a href="{html.escape(insight.url)}" style="color:#1a5fb4;">{title}</a>'
+        body += [
+            f'<h2 style="font-size:18px;color:#333;margin:24px 0 8px;">{title}</h2>',
+            f'<p style="margin:0 0 4px;"><strong>Category:</strong> {html.escape(insight.category)}</p>',
+            f'<p style="margin:0 0 12px;"><strong>Takeaway:</strong> <strong>{html.escape(insight.takeaway)}:</strong> '
+            f'{html.escape(insight.insight)}</p>',
+        ]
+        if insight.rationale:
+            items = ''.join(f'<li><strong>{html.escape(label)}:</strong> {html.escape(text)}</li>'
+                            for label, text in insight.rationale.items())
+            body.append(f'<p style="margin:0;"><strong>Rationale:</strong></p><ul style="margin:4px 0 0;">{items}</ul>')
+
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"></head>'
+        '<body style="margin:0;padding:0;background:#f4f4f4;">'
+        '<div style="max-width:680px;margin:0 auto;padding:24px;background:#ffffff;'
+        'font-family:Arial,Helvetica,sans-serif;font-size:14px;line-height:1.5;color:#333;">'
+        f"{''.join(body)}</div></body></html>"
+    )
+
+
+def render_docx(newsletter: Newsletter) -> Document:
+    """Render a newsletter as a Word Document object."""
+    if newsletter.markdown:
+        return generate_word_doc_from_markdown(newsletter.markdown)
+
+    doc = Document()
+    doc.add_heading(newsletter.title, level=1)
+
+    if newsletter.overview:
+        doc.add_heading("Executive Overview", level=2)
+        for line in newsletter.overview.splitlines():
+            stripped = line.strip()
+            if stripped.startswith(("- ", "* ", "+ ")):
+                add_formatted_text(doc.add_paragraph("", style='List Bullet'), stripped[2:].strip())
+            elif stripped:
+                add_formatted_text(doc.add_paragraph(), stripped)
+
+    for insight in newsletter.insights:
+        heading = doc.add_heading("", level=2)
+        if insight.url:
+            add_hyperlink(heading, insight.url, insight.title)
+        else:
+            heading.add_run(insight.title)
+
+        p = doc.add_paragraph()
+        p.add_run("Category:").bold = True
+        p.add_run(f" {insight.category}")
+
+        p = doc.add_paragraph()
+        p.add_run("Takeaway:").bold = True
+        p.add_run(" ")
+        p.add_run(f"{insight.takeaway}:").bold = True
+        doc.add_paragraph(insight.insight)
+
+        if insight.rationale:
+            doc.add_paragraph().add_run("Rationale:").bold = True
+            for label, text in insight.rationale.items():
+                p = doc.add_paragraph("", style='List Bullet')
+                p.add_run(f"{label}:").bold = True
+                p.add_run(f" {text}")
+    return doc
+
+def pdf_text(text: str) -> str:
+    return text.translate(PDF_TRANSLATION).encode('latin-1', 'replace').decode('latin-1')
+
+
+def write_pdf_inline(pdf: FPDF, text: str, style: str = ''):
+    """Write a line with inline **bold** and [text](url) markdown at the current position."""
+    pos = 0
+    for match in MARKDOWN_INLINE_PATTERN.finditer(text):
+        pdf.write(PDF_LINE_HEIGHT, pdf_text(text[pos:match.start()]))
+        if match.group('bold'):
+            pdf.set_font(style='B')
+            write_pdf_inline(pdf, match.group('bold'), style='B')
+        else:
+            pdf.set_font(style=style + 'U')
+            pdf.set_text_color(26, 95, 180)
+            pdf.write(PDF_LINE_HEIGHT, pdf_text(match.group('link_text')), link=match.group('link_url'))
+            pdf.set_text_color(0)
+        pdf.set_font(style=style)
+        pos = match.end()
+    pdf.write(PDF_LINE_HEIGHT, pdf_text(text[pos:]))
+
+
+def render_pdf(newsletter: Newsletter) -> bytes:
+    """
+    Render a newsletter as a PDF, laid out from its markdown rendering so that
+    structured and free-form fallback newsletters look the same.
+    """
+    pdf = FPDF()
+    pdf.set_margins(PDF_MARGIN, PDF_MARGIN)
+    pdf.add_page()
+    pdf.set_font(PDF_FONT, size=PDF_FONT_SIZE)
+
+    for line in render_markdown(newsletter).splitlines():
+        stripped = line.strip()
+        if not stripped:
+            pdf.ln(PDF_LINE_HEIGHT / 2)
+        elif stripped.startswith('#'):
+            level = len(stripped) - len(stripped.lstrip('#'))
+            pdf.set_font(style='B', size=PDF_HEADING_SIZES.get(level, 12))
+            pdf.ln(PDF_LINE_HEIGHT / 2)
+            write_pdf_inline(pdf, stripped[level:].strip(), style='B')
+            pdf.set_font(style='', size=PDF_FONT_SIZE)
+            pdf.ln(PDF_LINE_HEIGHT * 1.5)
+        elif stripped.startswith(('- ', '* ', '+ ')):
+            # Indent the bullet together with its wrapped lines
+            pdf.set_left_margin(PDF_MARGIN + PDF_BULLET_INDENT)
+            pdf.set_x(PDF_MARGIN + PDF_BULLET_INDENT)
+            pdf.write(PDF_LINE_HEIGHT, '- ')
+            write_pdf_inline(pdf, stripped[2:].strip())
+            pdf.set_left_margin(PDF_MARGIN)
+            pdf.ln(PDF_LINE_HEIGHT)
+        else:
+            write_pdf_inline(pdf, stripped)
+            pdf.ln(PDF_LINE_HEIGHT)
+    return bytes(pdf.output())
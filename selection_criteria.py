@@ -0,0 +1,94 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+OTHER_CATEGORY = 'Other'
+
+# Matches "Category 1. Enterprise Autonomous AI Agents" headings in the selection criteria document
+CATEGORY_PATTERN = re.compile(r'^\s*Category\s+\d+\s*[.:)-]\s*(?P<name>.+?)\s*$', re.IGNORECASE)
+KEYWORDS_PATTERN = re.compile(r'^\s*Keywords\s*:\s*(?P<keywords>.+?)\s*$', re.IGNORECASE)
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Suffixes stripped so that e.g. "explainable" matches "explainability" and "agents" matches "agent"
+SUFFIXES = ('ability', 'ibility', 'ities', 'ity', 'able', 'ible', 'ing', 'ers', 'er', 'es', 's', 'ed', 'al')
+MIN_STEM_LENGTH = 4
+
+STOPWORDS = {
+    'and', 'the', 'for', 'with', 'what', 'look', 'like', 'inside', 'use', 'cases',
+    'from', 'that', 'this', 'into', 'over', 'their', 'about',
+}
+
+
+def stem(token: str) -> str:
+    """Strip one common English suffix, keeping at least MIN_STEM_LENGTH characters."""
+    for suffix in SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+            return token[:-len(suffix)]
+    return token
+
+
+@dataclass
+class Category:
+    """A newsletter category parsed from the selection criteria profile."""
+    name: str
+    keywords: List[str] = field(default_factory=list)
+
+    def terms(self) -> List[str]:
+        """Significant stemmed tokens from the category name and keywords."""
+        tokens = TOKEN_PATTERN.findall(' '.join([self.name] + self.keywords).lower())
+        return sorted({stem(token) for token in tokens if len(token) > 2 and token not in STOPWORDS})
+
+
+def parse_categories(profile: str) -> List[Category]:
+    """
+    Extract the categories and their keywords from a selection criteria profile.
+
+    The profile is expected to follow the "Detailed Selection Criteria" layout,
+    where each category starts with a "Category N. Name" line that is followed by
+    a "Keywords: a, b, c" line. Returns an empty list if no categories are found.
+    """
+    categories = []
+    current = None
+    for line in profile.splitlines():
+        category_match = CATEGORY_PATTERN.match(line)
+        if category_match:
+            current = Category(name=category_match.group('name'))
+            categories.append(current)
+            continue
+
+        keywords_match = KEYWORDS_PATTERN.match(line)
+        if keywords_match and current is not None and not current.keywords:
+            keywords = keywords_match.group('keywords').rstrip('.')
+            current.keywords = [k.strip() for k in keywords.split(',') if k.strip()]
+    return categories
+
+
+def contains_phrase(token_text: str, phrase: str) -> bool:
+    """Whether the tokens of phrase occur consecutively in token_text (tokens joined and padded by spaces)."""
+    phrase_tokens = TOKEN_PATTERN.findall(phrase.lower())
+    return bool(phrase_tokens) and f" {' '.join(phrase_tokens)} " in token_text
+
+
+def score_category(text: str, category: Category) -> int:
+    """
+    Lexical relevance of text to a category: keyword phrases found as whole words
+    count double, individual (stemmed) name and keyword terms count once.
+
+    Matching is on token boundaries, so e.g. "data" does not match "database".
+    """
+    raw_tokens = TOKEN_PATTERN.findall(text.lower())
+    token_text = f" {' '.join(raw_tokens)} "
+    tokens = {stem(token) for token in raw_tokens}
+    score = sum(2 for keyword in category.keywords if contains_phrase(token_text, keyword))
+    score += sum(1 for term in category.terms() if term in tokens)
+    return score
+
+
+def assign_category(text: str, categories: List[Category]) -> Optional[Category]:
+    """Return the best matching category for text, or None if nothing matches."""
+    best, best_score = None, 0
+    for category in categories:
+        score = score_category(text, category)
+        if score > best_score:
+            best, best_score = category, score
+    return best
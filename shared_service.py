@@ -0,0 +1,263 @@
+import hashlib
+import threading
+import urllib.parse
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional
+
+from extract_content import extract_main_content
+from newsletter_pipeline import summarize_content
+
+DEFAULT_FETCH_WORKERS = 8
+DEFAULT_LLM_WORKERS = 4
+DEFAULT_CACHE_ENTRIES = 512
+
+
+class LRUCache:
+    """Small thread-safe LRU mapping used for the fetched content and summary caches."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+@dataclass(eq=False)
+class Job:
+    """A queued call; the same Job may sit in several sessions' queues when they share a key."""
+    fn: Callable[[], Any]
+    future: Future
+    key: Optional[Hashable] = None
+    started: bool = False
+
+
+class FairScheduler:
+    """
+    A worker pool that interleaves jobs from several sessions round-robin.
+
+    Each session has its own FIFO queue; workers take one job from the next
+    session that has work, so a session that submits hundreds of jobs cannot
+    starve one that submits a few. Jobs submitted with a key that is already
+    queued or running are not run again: the caller gets the existing Future.
+    A queued job is also added to the queue of each further session that asks
+    for it, so it runs at whichever of their turns comes first rather than only
+    at the original submitter's.
+    """
+
+    def __init__(self, workers: int, name: str = 'scheduler'):
+        self._queues = OrderedDict()  # session id -> deque of Job
+        self._in_flight = {}  # key -> Job
+        self._cond = threading.Condition()
+        for idx in range(workers):
+            threading.Thread(target=self._work, name=f"{name}-{idx}", daemon=True).start()
+
+    def submit(self, session_id: Hashable, fn: Callable[[], Any], key: Optional[Hashable] = None) -> Future:
+        """Queue fn for session_id, or return the in-flight Future for the same key."""
+        with self._cond:
+            job = self._in_flight.get(key) if key is not None else None
+            if job is not None:
+                queue = self._queues.get(session_id, ())
+                if not job.started and not any(queued is job for queued in queue):
+                    self._queues.setdefault(session_id, deque()).append(job)
+                    self._cond.notify()
+                return job.future
+
+            job = Job(fn=fn, future=Future(), key=key)
+            self._queues.setdefault(session_id, deque()).append(job)
+            if key is not None:
+                self._in_flight[key] = job
+            self._cond.notify()
+            return job.future
+
+    def cancel_session(self, session_id: Hashable) -> int:
+        """
+        Drop the session's queued jobs, e.g. when it reruns and resubmits its work.
+
+        Jobs that are running, or that another session is also waiting for, are
+        left alone. Returns the number of cancelled jobs.
+        """
+        with self._cond:
+            queue = self._queues.pop(session_id, ())
+            shared = {id(job) for other in self._queues.values() for job in other}
+            cancelled = 0
+            for job in queue:
+                if job.started or id(job) in shared:
+                    continue
+                job.started = True
+                job.future.cancel()
+                if job.key is not None and self._in_flight.get(job.key) is job:
+                    del self._in_flight[job.key]
+                cancelled += 1
+            return cancelled
+
+    def queue_position(self, session_id: Hashable) -> int:
+        """
+        1-based position in the rotation of the session's turn to run one of the
+        jobs it is waiting for, or 0 if none of them is still queued.
+        """
+        with self._cond:
+            ahead = 0
+            for queued_session, queue in self._queues.items():
+                if all(job.started for job in queue):
+                    continue
+                if queued_session == session_id:
+                    return ahead + 1
+                ahead += 1
+            return 0
+
+    def _next_job(self) -> Optional[Job]:
+        # Take the head job of the first session in rotation, then move that session to the back.
+        # Jobs already started from another session's queue are dropped.
+        while self._queues:
+            session_id, queue = next(iter(self._queues.items()))
+            job = queue.popleft()
+            del self._queues[session_id]
+            if queue:
+                self._queues[session_id] = queue
+            if not job.started:
+                job.started = True
+                return job
+        return None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                job = None
+                while job is None:
+                    while not self._queues:
+                        self._cond.wait()
+                    job = self._next_job()
+
+            try:
+                if job.future.set_running_or_notify_cancel():
+                    try:
+                        job.future.set_result(job.fn())
+                    except BaseException as e:
+                        job.future.set_exception(e)
+            finally:
+                with self._cond:
+                    if job.key is not None and self._in_flight.get(job.key) is job:
+                        del self._in_flight[job.key]
+
+
+def chain(future: Future, fn: Callable[[Any], Any]) -> Future:
+    """
+    Return a Future for fn(result) that completes when fn has run on the result
+    of future. fn may itself return a Future, which is then waited for.
+    """
+    chained = Future()
+
+    def on_done(done):
+        try:
+            result = fn(done.result())
+        except BaseException as e:
+            chained.set_exception(e)
+            return
+        if isinstance(result, Future):
+            result.add_done_callback(lambda inner: copy_result(inner, chained))
+        else:
+            chained.set_result(result)
+
+    future.add_done_callback(on_done)
+    return chained
+
+
+def completed(result) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def copy_result(source: Future, target: Future):
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class PipelineService:
+    """
+    Process-wide service shared by all Streamlit sessions.
+
+    Owns the fetch pool, the LLM scheduler and the summary cache. Work from
+    concurrent sessions is interleaved fairly, the same URL is fetched at most
+    once at a time, and the same summary prompt is sent to the LLM at most once
+    at a time; completed summaries are cached for later sessions. Extracted page
+    texts are not cached, as they would keep up to megabytes per page alive in
+    the long-lived process.
+    """
+
+    def __init__(self, fetch_workers: int = DEFAULT_FETCH_WORKERS, llm_workers: int = DEFAULT_LLM_WORKERS,
+                 cache_entries: int = DEFAULT_CACHE_ENTRIES):
+        self.fetch_scheduler = FairScheduler(fetch_workers, name='fetch')
+        self.llm_scheduler = FairScheduler(llm_workers, name='llm')
+        self.summary_cache = LRUCache(cache_entries)
+
+    def fetch(self, session_id: Hashable, url: str) -> Future:
+        """Fetch and extract a page; resolves to (title, content)."""
+        return self.fetch_scheduler.submit(session_id, lambda: extract_main_content(url), key=url)
+
+    def summarize(self, session_id: Hashable, llm, content: str, user_profile: str) -> Future:
+        """Summarize content with llm; resolves to the summary text."""
+        model = getattr(llm, 'model', type(llm).__name__)
+        key = hashlib.sha256('\0'.join([model, user_profile, content]).encode('utf-8')).hexdigest()
+        cached = self.summary_cache.get(key)
+        if cached is not None:
+            return completed(cached)
+
+        def run():
+            summary = summarize_content(llm, content, user_profile)
+            self.summary_cache.put(key, summary)
+            return summary
+
+        return self.llm_scheduler.submit(session_id, run, key=key)
+
+    def summarize_link(self, session_id: Hashable, llm, url: str, user_profile: str) -> Future:
+        """
+        Fetch and summarize one link; resolves to (url, summary), or None if no
+        content could be extracted.
+        """
+        clean_url = urllib.parse.unquote(url).strip()
+
+        def on_fetched(result):
+            title, content = result
+            if not content:
+                return None
+            return chain(self.summarize(session_id, llm, content, user_profile),
+                         lambda summary: (clean_url, summary))
+
+        return chain(self.fetch(session_id, clean_url), on_fetched)
+
+    def run_llm(self, session_id: Hashable, fn: Callable[[], Any]) -> Future:
+        """
+        Run one LLM call (e.g. a synthesis section) through the fair LLM scheduler.
+
+        fn should not wait on other jobs of the scheduler: a worker blocked on the
+        queue it serves can deadlock the pool. Pass run_llm as the submit callable
+        of the synthesis functions instead of running a whole synthesis through it.
+        """
+        return self.llm_scheduler.submit(session_id, fn)
+
+    def cancel_session(self, session_id: Hashable) -> int:
+        """Cancel the session's queued fetch and LLM jobs; returns how many were cancelled."""
+        return self.fetch_scheduler.cancel_session(session_id) + self.llm_scheduler.cancel_session(session_id)
+
+    def queue_position(self, session_id: Hashable) -> int:
+        """Position of the session's next job in the more backed-up of the two queues (0 if nothing is queued)."""
+        return max(self.fetch_scheduler.queue_position(session_id),
+                   self.llm_scheduler.queue_position(session_id))
@@ -0,0 +1,59 @@
+import os
+import sqlite3
+import tempfile
+from typing import Iterator, Optional, Tuple
+
+
+class SummaryStore:
+    """
+    Disk-backed, append-only list of (url, summary) pairs.
+
+    Summaries are written to a temporary SQLite database as they are produced,
+    so a large digest does not hold every summary in memory while the remaining
+    links are still being fetched. Iterating reads the rows back lazily in
+    insertion order, so the store can be passed anywhere a list of
+    (url, summary) pairs is expected.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='summaries-', suffix='.sqlite3')
+            os.close(fd)
+            self._owns_file = True
+        else:
+            self._owns_file = False
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS summaries (id INTEGER PRIMARY KEY, url TEXT, summary TEXT)'
+        )
+        self._conn.commit()
+
+    def append(self, item: Tuple[str, str]):
+        """Store a (url, summary) pair."""
+        url, summary = item
+        self._conn.execute('INSERT INTO summaries (url, summary) VALUES (?, ?)', (url, summary))
+        self._conn.commit()
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        cursor = self._conn.execute('SELECT url, summary FROM summaries ORDER BY id')
+        try:
+            for row in cursor:
+                yield row[0], row[1]
+        finally:
+            cursor.close()
+
+    def __len__(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM summaries').fetchone()[0]
+
+    def close(self):
+        """Close the database and delete it if it is a temporary file."""
+        self._conn.close()
+        if self._owns_file and os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def __enter__(self) -> 'SummaryStore':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
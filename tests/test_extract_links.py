@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+import extract_links
+from extract_links import PdfLink, extract_link_entries_from_pdf
+
+DIGEST_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data',
+                           'Jan 31 Google Alert  Daily Digest.pdf')
+
+
+def link_annotation(url, rect=None):
+    annotation = {'/Subtype': '/Link', '/A': {'/URI': url}}
+    if rect is not None:
+        annotation['/Rect'] = rect
+    return annotation
+
+
+class FakePage(dict):
+    """A page whose text extraction reports one fragment inside the first link or fails."""
+
+    def __init__(self, annotations, fail_text=False):
+        super().__init__({'/Annots': annotations})
+        self.fail_text = fail_text
+
+    def extract_text(self, visitor_text):
+        if self.fail_text:
+            raise KeyError('/Font')
+        visitor_text('Headline', [1, 0, 0, 1, 0, 0], [1, 0, 0, 1, 10, 105], None, 10)
+
+
+@pytest.fixture
+def fake_pdf(monkeypatch, tmp_path):
+    path = tmp_path / 'digest.pdf'
+    path.write_bytes(b'%PDF')
+
+    def use_pages(pages):
+        monkeypatch.setattr(extract_links.PyPDF2, 'PdfReader', lambda file: type('Reader', (), {'pages': pages}))
+        return str(path)
+
+    return use_pages
+
+
+def test_link_without_rect_is_kept_without_text(fake_pdf):
+    path = fake_pdf([FakePage([link_annotation('https://a', [0, 100, 200, 110]), link_annotation('https://b')])])
+    assert extract_link_entries_from_pdf(path) == [PdfLink('https://a', title='Headline'), PdfLink('https://b')]
+
+
+def test_page_text_failure_keeps_links_and_later_pages(fake_pdf):
+    path = fake_pdf([
+        FakePage([link_annotation('https://a', [0, 100, 200, 110])], fail_text=True),
+        FakePage([link_annotation('https://b', [0, 100, 200, 110])]),
+    ])
+    assert extract_link_entries_from_pdf(path) == [PdfLink('https://a'), PdfLink('https://b', title='Headline')]
+
+
+def test_bundled_digest_links_match_plain_uri_extraction():
+    entries = extract_link_entries_from_pdf(DIGEST_PATH)
+    assert [entry.url for entry in entries] == extract_links.extract_links_from_pdf(DIGEST_PATH)
+    assert any(entry.title for entry in entries)
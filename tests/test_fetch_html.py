@@ -0,0 +1,67 @@
+import pytest
+
+import extract_content
+from extract_content import CHUNK_SIZE, fetch_html
+
+
+class FakeStreamedResponse:
+    """Stands in for a streamed requests.Response, recording how many body chunks were read."""
+
+    def __init__(self, content_type, chunks, encoding='utf-8'):
+        self.headers = {'Content-Type': content_type}
+        self.encoding = encoding
+        self.chunks = chunks
+        self.chunks_read = 0
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for chunk in self.chunks:
+            self.chunks_read += 1
+            yield chunk
+
+
+@pytest.fixture
+def serve(monkeypatch):
+    def use(response):
+        def fake_get(url, **kwargs):
+            assert kwargs.get('stream') is True
+            return response
+        monkeypatch.setattr(extract_content.requests, 'get', fake_get)
+        return response
+    return use
+
+
+def test_body_is_truncated_at_the_byte_cap(serve):
+    response = serve(FakeStreamedResponse('text/html; charset=utf-8', [b'a' * CHUNK_SIZE] * 10))
+    html = fetch_html('https://example.com', max_bytes=CHUNK_SIZE + 10)
+    assert len(html) == CHUNK_SIZE + 10
+    # Reading stops at the chunk that crosses the cap instead of draining the stream
+    assert response.chunks_read == 2
+    assert response.closed
+
+
+def test_non_html_content_type_is_rejected_before_reading_the_body(serve):
+    response = serve(FakeStreamedResponse('application/pdf', [b'%PDF-1.7'] * 3))
+    assert fetch_html('https://example.com/paper.pdf') is None
+    assert response.chunks_read == 0
+    assert response.closed
+
+
+def test_missing_content_type_is_treated_as_html(serve):
+    serve(FakeStreamedResponse('', ['<p>café</p>'.encode('utf-8')], encoding=None))
+    assert fetch_html('https://example.com') == '<p>café</p>'
+
+
+def test_multibyte_character_cut_by_the_cap_is_replaced(serve):
+    serve(FakeStreamedResponse('text/html', ['<p>é</p>'.encode('utf-8')]))
+    # The cap falls inside the two-byte "é"
+    assert fetch_html('https://example.com', max_bytes=4) == '<p>�'
@@ -0,0 +1,77 @@
+from hierarchical_synthesis import (MAX_SECTION_ARTICLES, batch_groups, group_summaries_by_category,
+                                    merge_sections, synthesize_hierarchically, synthesize_newsletter_hierarchically)
+from llm_interface import LLMResponse, MockLLM
+from selection_criteria import OTHER_CATEGORY
+
+FREE_FORM_PROFILE = "I lead a retail bank's digital team and care about AI in customer service."
+
+
+def make_summaries(count):
+    return [(f"https://example.com/{idx}", f"Article {idx} about banking.") for idx in range(count)]
+
+
+def make_llm():
+    llm = MockLLM()
+    llm.initialize()
+    return llm
+
+
+def test_free_form_profile_is_split_into_batches():
+    groups = group_summaries_by_category(FREE_FORM_PROFILE, make_summaries(60))
+    assert list(groups) == [OTHER_CATEGORY]
+
+    batches = batch_groups(groups)
+    assert len(batches) == 60 // MAX_SECTION_ARTICLES
+    assert all(category == OTHER_CATEGORY and len(batch) <= MAX_SECTION_ARTICLES for category, batch in batches)
+    assert [item for _, batch in batches for item in batch] == make_summaries(60)
+
+
+def test_merge_sections_joins_consecutive_batches_of_a_category():
+    sections = [('A', 'one'), ('A', 'two'), ('B', 'three')]
+    assert merge_sections(sections) == [('A', 'one\n\ntwo'), ('B', 'three')]
+
+
+def test_hierarchical_synthesis_sends_one_call_per_batch():
+    llm = make_llm()
+    newsletter = synthesize_newsletter_hierarchically(llm, FREE_FORM_PROFILE, make_summaries(25),
+                                                      include_overview=False)
+    assert llm.usage.requests == 3
+    assert len(newsletter.insights) == 25
+
+    markdown = synthesize_hierarchically(make_llm(), FREE_FORM_PROFILE, make_summaries(25), include_overview=False)
+    assert markdown.count(f"# {OTHER_CATEGORY}") == 1
+
+
+class TruncatingLLM(MockLLM):
+    """Truncates the JSON reply of any batch with more than max_articles articles, or of the given URLs."""
+
+    def __init__(self, max_articles, failing_urls=()):
+        super().__init__()
+        self.initialize()
+        self.max_articles = max_articles
+        self.failing_urls = failing_urls
+
+    def generate_response(self, prompt, **kwargs):
+        urls = [line[len('URL: '):] for line in prompt.splitlines() if line.startswith('URL: ')]
+        if kwargs.get('json_mode') and (len(urls) > self.max_articles or set(urls) & set(self.failing_urls)):
+            return LLMResponse('{"articles": [{"title": "cut', None, {'finish_reason': 'length'})
+        return super().generate_response(prompt, **kwargs)
+
+
+def test_truncated_batch_is_split_and_retried():
+    summaries = make_summaries(25)
+    # The two full batches of 10 are truncated; their halves of 5 succeed
+    llm = TruncatingLLM(max_articles=5)
+    newsletter = synthesize_newsletter_hierarchically(llm, FREE_FORM_PROFILE, summaries, include_overview=False)
+    assert [insight.url for insight in newsletter.insights] == [url for url, _ in summaries]
+    # Truncated replies are not recorded: the last batch of 5 plus the four halves succeeded
+    assert llm.usage.requests == 5
+
+
+def test_article_that_keeps_failing_is_kept_with_its_summary():
+    summaries = make_summaries(3)
+    llm = TruncatingLLM(max_articles=10, failing_urls=['https://example.com/1'])
+    newsletter = synthesize_newsletter_hierarchically(llm, FREE_FORM_PROFILE, summaries, include_overview=False)
+    assert [insight.url for insight in newsletter.insights] == [url for url, _ in summaries]
+    kept = newsletter.insights[1]
+    assert kept.title == 'https://example.com/1' and kept.insight == 'Article 1 about banking.'
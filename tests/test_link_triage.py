@@ -0,0 +1,39 @@
+from extract_links import PdfLink
+from link_triage import profile_category, triage_links
+
+PROFILE = """Category 1. Enterprise Autonomous AI Agents
+Keywords: Autonomous agents, enterprise AI
+"""
+
+RELEVANT = PdfLink('https://a', title='Autonomous agents arrive in enterprise AI')
+IRRELEVANT = PdfLink('https://b', title='Local bakery wins award')
+UNTITLED = PdfLink('https://c')
+
+
+def test_threshold_zero_keeps_every_link():
+    kept, skipped = triage_links([IRRELEVANT, RELEVANT, UNTITLED], PROFILE, threshold=0)
+    assert {result.link.url for result in kept} == {'https://a', 'https://b', 'https://c'}
+    assert skipped == []
+
+
+def test_low_scoring_links_are_skipped_and_kept_links_sorted_by_score():
+    kept, skipped = triage_links([IRRELEVANT, RELEVANT], PROFILE, threshold=1)
+    assert [result.link for result in kept] == [RELEVANT]
+    assert kept[0].category == 'Enterprise Autonomous AI Agents'
+    assert [result.link for result in skipped] == [IRRELEVANT]
+
+
+def test_links_without_text_are_always_kept():
+    kept, skipped = triage_links([UNTITLED], PROFILE, threshold=10)
+    assert [result.link for result in kept] == [UNTITLED] and skipped == []
+
+
+def test_free_form_profile_falls_back_to_profile_words():
+    profile = 'I run a retail bank and follow fraud detection with machine learning.'
+    category = profile_category(profile)
+    assert 'fraud' in category.keywords and 'with' not in category.keywords
+
+    kept, skipped = triage_links([PdfLink('https://d', title='Machine learning cuts card fraud'),
+                                  PdfLink('https://e', title='Bankruptcy database misleads')], profile, threshold=1)
+    assert [result.link.url for result in kept] == ['https://d']
+    assert [result.link.url for result in skipped] == ['https://e']
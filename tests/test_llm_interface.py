@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+from llm_interface import ChatGPTLLM
+from newsletter_pipeline import summarize_content
+from prompt_builder import build_summary_prompt
+
+PROFILE = "Category 1. Enterprise Autonomous AI Agents\nKeywords: Autonomous agents"
+
+
+class FakeCompletions:
+    """Records chat.completions.create requests and answers with fixed usage figures."""
+
+    def __init__(self, cached_tokens):
+        self.cached_tokens = cached_tokens
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        usage = SimpleNamespace(prompt_tokens=2000, completion_tokens=100,
+                                prompt_tokens_details=SimpleNamespace(cached_tokens=self.cached_tokens))
+        choice = SimpleNamespace(message=SimpleNamespace(content='{"ok": true}'), finish_reason='stop')
+        return SimpleNamespace(choices=[choice], usage=usage)
+
+
+def make_llm(model='gpt-4o', cached_tokens=1536):
+    llm = ChatGPTLLM(api_key='test', model=model)
+    completions = FakeCompletions(cached_tokens)
+    llm.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return llm, completions
+
+
+def test_system_prompt_is_sent_as_a_separate_leading_message():
+    llm, completions = make_llm()
+    response = llm.generate_response('article text', system_prompt='instructions', json_mode=True)
+    request = completions.requests[0]
+    assert request['messages'] == [{'role': 'system', 'content': 'instructions'},
+                                   {'role': 'user', 'content': 'article text'}]
+    assert request['response_format'] == {'type': 'json_object'}
+    assert response.metadata['finish_reason'] == 'stop'
+
+
+def test_cached_tokens_are_recorded_in_usage_stats():
+    llm, _ = make_llm()
+    llm.generate_response('one', system_prompt='instructions')
+    response = llm.generate_response('two', system_prompt='instructions')
+    assert response.metadata['cached_tokens'] == 1536
+
+    usage = llm.usage.as_dict()
+    assert usage['requests'] == 2
+    assert usage['prompt_tokens'] == 4000
+    assert usage['cached_tokens'] == 3072
+    assert usage['uncached_prompt_tokens'] == 928
+    assert usage['cache_hit_ratio'] == 0.768
+
+
+def test_missing_usage_details_count_as_uncached():
+    llm, completions = make_llm(cached_tokens=None)
+    llm.generate_response('one')
+    assert llm.usage.as_dict()['cached_tokens'] == 0
+    assert 'response_format' not in completions.requests[0]
+
+
+def test_summary_prompt_only_carries_the_profile_for_caching_models():
+    assert PROFILE not in build_summary_prompt(PROFILE, 'content').system
+    assert PROFILE in build_summary_prompt(PROFILE, 'content', include_profile=True).system
+    # Structured summaries need the categories from the profile
+    assert PROFILE in build_summary_prompt(PROFILE, 'content', structured=True).system
+
+    for model, expected in [('gpt-3.5-turbo', False), ('gpt-4o-mini', True)]:
+        llm, completions = make_llm(model=model)
+        summarize_content(llm, 'content', PROFILE)
+        assert (PROFILE in completions.requests[0]['messages'][0]['content']) is expected
@@ -0,0 +1,34 @@
+import pytest
+
+from newsletter_model import ArticleInsight, parse_insight, parse_insights
+
+
+def test_parse_insights_reads_all_fields():
+    text = ('{"articles": [{"title": "T", "url": "https://a", "category": "C", "takeaway": "K", '
+            '"insight": "I", "rationale": {"Applications": "A"}}]}')
+    assert parse_insights(text) == [ArticleInsight("T", "https://a", "C", "K", "I", {"Applications": "A"})]
+
+
+def test_parse_insights_accepts_fenced_json_and_drops_untitled_articles():
+    text = '```json\n{"articles": [{"title": "T"}, {"url": "https://no-title"}, "junk"]}\n```'
+    insights = parse_insights(text)
+    assert [insight.title for insight in insights] == ["T"]
+
+
+@pytest.mark.parametrize('rationale, expected', [
+    ('Prose rationale.', {'Rationale': 'Prose rationale.'}),
+    (42, {'Rationale': '42'}),
+    (['trend', 'risk'], {'Emerging trends': 'trend', 'Potential risks': 'risk'}),
+    (None, {}),
+    ({'Applications': ''}, {}),
+])
+def test_parse_insights_tolerates_mistyped_rationale(rationale, expected):
+    insight = ArticleInsight.from_dict({'title': 'x', 'rationale': rationale})
+    assert insight.rationale == expected
+
+
+def test_parse_insights_rejects_non_object():
+    with pytest.raises(ValueError):
+        parse_insights('[1, 2]')
+    with pytest.raises(ValueError):
+        parse_insight('{"title": "truncated')
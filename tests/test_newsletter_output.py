@@ -0,0 +1,97 @@
+import os
+
+import pytest
+
+import newsletter_output
+from newsletter_model import ArticleInsight, Newsletter
+from newsletter_output import ArtifactCache, render_all, send_newsletter, write_artifacts
+
+
+def make_newsletter(title='T'):
+    insight = ArticleInsight(title=title, url='https://example.com/a', category='C', takeaway='K',
+                             insight='Insight — with “quotes”.', rationale={'Applications': 'A'})
+    return Newsletter(insights=[insight], overview='- Theme')
+
+
+@pytest.fixture
+def render_calls(monkeypatch):
+    """Wrap every renderer so that calls are counted per format."""
+    calls = []
+    renderers = {}
+    for fmt, (renderer, extension, mime_type) in newsletter_output.RENDERERS.items():
+        def counted(newsletter, fmt=fmt, renderer=renderer):
+            calls.append(fmt)
+            return renderer(newsletter)
+        renderers[fmt] = (counted, extension, mime_type)
+    monkeypatch.setattr(newsletter_output, 'RENDERERS', renderers)
+    return calls
+
+
+def test_render_all_reuses_cached_artifacts(render_calls):
+    cache = ArtifactCache()
+    first = render_all(make_newsletter(), formats=('html', 'txt', 'docx', 'pdf'), cache=cache)
+    second = render_all(make_newsletter(), formats=('pdf', 'html'), cache=cache)
+    assert sorted(render_calls) == ['docx', 'html', 'pdf', 'txt']
+    assert second['pdf'] is first['pdf'] and second['html'] is first['html']
+
+    # Different content is a different cache key
+    render_all(make_newsletter(title='Other'), formats=('html',), cache=cache)
+    assert render_calls.count('html') == 2
+
+
+def test_render_all_rejects_unknown_formats():
+    with pytest.raises(ValueError):
+        render_all(make_newsletter(), formats=('rtf',), cache=ArtifactCache())
+
+
+def test_pdf_artifact_is_a_pdf_with_the_article_link():
+    artifact = render_all(make_newsletter(), formats=('pdf',), cache=ArtifactCache())['pdf']
+    assert artifact.filename == 'personalized_summary.pdf' and artifact.mime_type == 'application/pdf'
+    assert artifact.data.startswith(b'%PDF') and b'https://example.com/a' in artifact.data
+
+
+def test_write_artifacts_writes_each_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(newsletter_output, 'WRITE_CHUNK_SIZE', 7)
+    artifacts = render_all(make_newsletter(), formats=('txt', 'html'), cache=ArtifactCache(), basename='issue')
+    paths = write_artifacts(artifacts, str(tmp_path / 'out'))
+    assert [os.path.basename(path) for path in paths] == ['issue.txt', 'issue.html']
+    for path, artifact in zip(paths, artifacts.values()):
+        with open(path, 'rb') as f:
+            assert f.read() == artifact.data
+
+
+class FakeSMTP:
+    instances = []
+
+    def __init__(self, host, port):
+        self.address = (host, port)
+        self.sent = []
+        FakeSMTP.instances.append(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def send_message(self, message):
+        self.sent.append((message['To'], message.as_bytes()))
+
+
+def test_send_newsletter_renders_once_and_sends_per_recipient(render_calls, monkeypatch):
+    FakeSMTP.instances = []
+    monkeypatch.setattr(newsletter_output.smtplib, 'SMTP', FakeSMTP)
+    cache = ArtifactCache()
+    recipients = [f'reader{idx}@example.com' for idx in range(5)]
+
+    sent = send_newsletter(make_newsletter(), 'news@example.com', recipients, cache=cache)
+
+    assert sent == 5
+    assert sorted(render_calls) == ['docx', 'html', 'txt']
+    # A second send of the same content is served entirely from the cache
+    send_newsletter(make_newsletter(), 'news@example.com', recipients[:1], cache=cache)
+    assert len(render_calls) == 3
+    smtp = FakeSMTP.instances[0]
+    assert smtp.address == (newsletter_output.DEFAULT_SMTP_HOST, newsletter_output.DEFAULT_SMTP_PORT)
+    assert [to for to, _ in smtp.sent] == recipients
+    assert all(b'personalized_summary.docx' in data for _, data in smtp.sent)
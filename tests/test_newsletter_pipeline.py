@@ -0,0 +1,54 @@
+from llm_interface import LLMResponse
+from newsletter_pipeline import synthesize_newsletter
+from renderers import render_docx, render_html, render_markdown, render_text
+
+SUMMARIES = [("https://a", "summary")]
+MARKDOWN = "# Curated Articles\n\n## Category 1\n\n- **[Title](https://a)**: takeaway"
+
+
+class ScriptedLLM:
+    """Returns a JSON reply (with the given finish reason) in JSON mode and fixed markdown otherwise."""
+
+    def __init__(self, json_text, finish_reason='stop'):
+        self.json_text = json_text
+        self.finish_reason = finish_reason
+        self.calls = []
+
+    def generate_response(self, prompt, system_prompt=None, json_mode=False, **kwargs):
+        self.calls.append(json_mode)
+        if json_mode:
+            return LLMResponse(self.json_text, None, {'finish_reason': self.finish_reason})
+        return LLMResponse(MARKDOWN, None, {'finish_reason': 'stop'})
+
+
+def test_synthesize_newsletter_parses_structured_reply():
+    llm = ScriptedLLM('{"articles": [{"title": "T", "url": "https://a"}]}')
+    newsletter = synthesize_newsletter(llm, 'profile', SUMMARIES)
+    assert [insight.title for insight in newsletter.insights] == ['T']
+    assert newsletter.markdown == ''
+    assert llm.calls == [True]
+
+
+def test_synthesize_newsletter_falls_back_to_markdown_on_invalid_json():
+    llm = ScriptedLLM('not json')
+    newsletter = synthesize_newsletter(llm, 'profile', SUMMARIES)
+    assert newsletter.markdown == MARKDOWN
+    assert llm.calls == [True, False]
+
+
+def test_synthesize_newsletter_falls_back_to_markdown_when_truncated():
+    # Truncated output may still be parseable after fence stripping; it is incomplete either way
+    llm = ScriptedLLM('{"articles": []}', finish_reason='length')
+    newsletter = synthesize_newsletter(llm, 'profile', SUMMARIES)
+    assert newsletter.markdown == MARKDOWN
+    assert llm.calls == [True, False]
+
+
+def test_markdown_fallback_renders_in_every_format():
+    llm = ScriptedLLM('{"articles": [{"title": "cut off')
+    newsletter = synthesize_newsletter(llm, 'profile', SUMMARIES)
+    assert render_markdown(newsletter) == MARKDOWN
+    assert 'Category 1' in render_text(newsletter) and '#' not in render_text(newsletter)
+    html = render_html(newsletter)
+    assert '<h2' in html and 'href="https://a"' in html
+    assert 'Category 1' in [paragraph.text for paragraph in render_docx(newsletter).paragraphs]
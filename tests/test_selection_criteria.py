@@ -0,0 +1,53 @@
+import pytest
+
+from selection_criteria import Category, assign_category, parse_categories, score_category, stem
+
+PROFILE = """Detailed Selection Criteria
+
+Category 1. Enterprise Autonomous AI Agents
+Keywords: Autonomous agents, enterprise AI, agentic workflows.
+
+Category 2: Responsible AI and Governance
+Keywords: Explainability, AI regulation, bias
+"""
+
+
+@pytest.mark.parametrize('token, expected', [
+    ('explainability', 'explain'),
+    ('explainable', 'explain'),
+    ('agents', 'agent'),
+    ('regulations', 'regulation'),
+    # Short stems are left alone
+    ('bias', 'bias'),
+    ('uses', 'uses'),
+])
+def test_stem(token, expected):
+    assert stem(token) == expected
+
+
+def test_parse_categories_reads_names_and_keywords():
+    categories = parse_categories(PROFILE)
+    assert [category.name for category in categories] == ['Enterprise Autonomous AI Agents',
+                                                           'Responsible AI and Governance']
+    assert categories[0].keywords == ['Autonomous agents', 'enterprise AI', 'agentic workflows']
+    assert parse_categories('I like AI news.') == []
+
+
+def test_keywords_match_on_word_boundaries():
+    category = Category(name='Profile', keywords=['data', 'lead'])
+    assert score_category('A new database is misleading', category) == 0
+    assert score_category('Data teams lead the way', category) > 0
+
+
+def test_keyword_phrases_match_across_punctuation():
+    category = Category(name='X', keywords=['open-source models'])
+    assert score_category('Open source models, explained', category) >= 2
+
+
+def test_stemming_drives_category_assignment():
+    categories = parse_categories(PROFILE)
+    assert assign_category('Why explainable models matter to regulators', categories).name == \
+        'Responsible AI and Governance'
+    assert assign_category('Agentic workflows reach the enterprise', categories).name == \
+        'Enterprise Autonomous AI Agents'
+    assert assign_category('A recipe for sourdough', categories) is None
@@ -0,0 +1,119 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from llm_interface import MockLLM
+from newsletter_pipeline import synthesize_newsletter
+from shared_service import FairScheduler, PipelineService, chain, completed
+
+TIMEOUT = 5
+
+
+def blocked_scheduler():
+    """A one-worker scheduler whose worker is held by a job until the returned event is set."""
+    scheduler = FairScheduler(1)
+    started, release = threading.Event(), threading.Event()
+    scheduler.submit('blocker', lambda: (started.set(), release.wait(TIMEOUT)))
+    assert started.wait(TIMEOUT)
+    return scheduler, release
+
+
+def test_sessions_are_served_round_robin():
+    scheduler, release = blocked_scheduler()
+    order = []
+    futures = [scheduler.submit('a', lambda i=i: order.append(f'a{i}')) for i in range(3)]
+    futures += [scheduler.submit('b', lambda i=i: order.append(f'b{i}')) for i in range(2)]
+    release.set()
+    for future in futures:
+        future.result(TIMEOUT)
+    assert order == ['a0', 'b0', 'a1', 'b1', 'a2']
+
+
+def test_same_key_runs_once_and_shares_the_future():
+    scheduler, release = blocked_scheduler()
+    calls = []
+    first = scheduler.submit('a', lambda: calls.append('a') or 'result', key='k')
+    second = scheduler.submit('b', lambda: calls.append('b') or 'other', key='k')
+    release.set()
+    assert second is first
+    assert first.result(TIMEOUT) == 'result'
+    assert calls == ['a']
+
+
+def test_deduped_job_runs_at_the_waiting_sessions_turn():
+    scheduler, release = blocked_scheduler()
+    order = []
+    futures = [scheduler.submit('a', lambda i=i: order.append(f'a{i}'), key=f'a{i}') for i in range(3)]
+    # b asks for a's last job: it should not have to wait behind a's whole queue
+    shared = scheduler.submit('b', lambda: order.append('b'), key='a2')
+    assert scheduler.queue_position('a') == 1
+    assert scheduler.queue_position('b') == 2
+    release.set()
+    for future in futures + [shared]:
+        future.result(TIMEOUT)
+    assert order == ['a0', 'a2', 'a1']
+    assert scheduler.queue_position('a') == scheduler.queue_position('b') == 0
+
+
+def test_chain_applies_fn_to_the_result():
+    source = Future()
+    chained = chain(source, lambda value: value + 1)
+    source.set_result(1)
+    assert chained.result(TIMEOUT) == 2
+
+
+def test_chain_waits_for_a_future_returned_by_fn():
+    source, inner = Future(), Future()
+    chained = chain(source, lambda value: inner)
+    source.set_result(1)
+    assert not chained.done()
+    inner.set_result('inner')
+    assert chained.result(TIMEOUT) == 'inner'
+
+
+def test_chain_propagates_exceptions():
+    failed = chain(completed(1), lambda value: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        failed.result(TIMEOUT)
+
+    source = Future()
+    chained = chain(source, lambda value: value)
+    source.set_exception(KeyError('x'))
+    with pytest.raises(KeyError):
+        chained.result(TIMEOUT)
+
+
+def test_hierarchical_synthesis_runs_every_call_through_the_scheduler():
+    llm = MockLLM()
+    llm.initialize()
+    service = PipelineService(fetch_workers=1, llm_workers=2)
+    submitted = []
+
+    def submit(fn):
+        submitted.append(fn)
+        return service.run_llm('session', fn)
+
+    summaries = [(f"https://example.com/{idx}", f"Article {idx}.") for idx in range(25)]
+    newsletter = synthesize_newsletter(llm, 'Free-form profile.', summaries, hierarchical=True, submit=submit)
+    assert len(newsletter.insights) == 25
+    # Three batches of the Other group plus the overview, and nothing outside the scheduler
+    assert len(submitted) == llm.usage.requests == 4
+
+
+def test_cancel_session_drops_only_its_unshared_queued_jobs():
+    scheduler, release = blocked_scheduler()
+    ran = []
+    own = scheduler.submit('a', lambda: ran.append('own'), key='own')
+    shared = scheduler.submit('a', lambda: ran.append('shared'), key='shared')
+    assert scheduler.submit('b', lambda: ran.append('b'), key='shared') is shared
+
+    assert scheduler.cancel_session('a') == 1
+    assert own.cancelled()
+    assert scheduler.queue_position('a') == 0
+    release.set()
+    shared.result(TIMEOUT)
+    assert ran == ['shared']
+
+    # The cancelled key is no longer in flight, so a resubmission runs it again
+    assert scheduler.submit('a', lambda: 'again', key='own').result(TIMEOUT) == 'again'
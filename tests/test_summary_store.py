@@ -0,0 +1,37 @@
+import os
+
+from summary_store import SummaryStore
+
+
+def test_iterates_in_insertion_order_and_counts():
+    with SummaryStore() as store:
+        items = [(f"https://example.com/{idx}", f"summary {idx}") for idx in (3, 1, 2)]
+        for item in items:
+            store.append(item)
+        assert len(store) == 3
+        assert list(store) == items
+        # Iteration is repeatable, e.g. for the synthesis prompt and a later render
+        assert list(store) == items
+
+
+def test_empty_store():
+    with SummaryStore() as store:
+        assert len(store) == 0
+        assert list(store) == []
+
+
+def test_close_deletes_the_temporary_file():
+    store = SummaryStore()
+    store.append(('https://example.com', 'summary'))
+    assert os.path.exists(store.path)
+    store.close()
+    assert not os.path.exists(store.path)
+
+
+def test_close_keeps_a_caller_supplied_file(tmp_path):
+    path = str(tmp_path / 'summaries.sqlite3')
+    with SummaryStore(path) as store:
+        store.append(('https://example.com', 'summary'))
+    assert os.path.exists(path)
+    with SummaryStore(path) as reopened:
+        assert list(reopened) == [('https://example.com', 'summary')]